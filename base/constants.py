@@ -36,10 +36,22 @@ V4_UNIVERSAL_ROUTER = Web3.to_checksum_address("0x6ff5693b99212da76ad316178a184a
 BLOCKED_HOOKS: set[str] = set()
 
 # Addresses that represent ETH (native or wrapped) for pair filtering
-ETH_ADDRESSES = {
+ETH_ADDRESSES = frozenset({
     ETH_NATIVE.lower(),
     WETH.lower(),
-}
+})
+
+# Established tokens that get new ETH pools all the time but are never "new
+# tokens". Pools against these are dropped at creation, so they never get a
+# state, a tracked pool (V3 swap polling) or a discovery entry.
+ESTABLISHED_TOKENS: frozenset[str] = frozenset({
+    USDC.lower(),
+    USDbC.lower(),
+    "0x50c5725949a6f0c72e6c4a641f24049a917db0cb",  # DAI
+    "0x2ae3f1ec7f1f5012cfeab0185bfc7aa3cf0dec22",  # cbETH
+    "0xcbb7c0000ab88b473b1f5afd9ef808440eed33bf",  # cbBTC
+    "0x940181a94a35a4569e4529a3cdfb74e38fd98631",  # AERO
+})
 
 # ═══════════════════════════════════════════════════════════════
 #  EVENT TOPIC HASHES
@@ -5,6 +5,7 @@ Non-blocking: runs as a background task per token, results stored in TokenState.
 import asyncio
 import logging
 
+import config
 from base.constants import DANGEROUS_SELECTORS, CONTEXT_SELECTORS, PROXY_PATTERNS
 
 logger = logging.getLogger("safety")
@@ -15,6 +16,8 @@ class SafetyChecker:
 
     def __init__(self, w3):
         self.w3 = w3
+        # _safety_loop spawns one task per new token; cap how many hit the RPC at once
+        self._sem = asyncio.Semaphore(config.SAFETY_RPC_CONCURRENCY)
 
     async def check_token(self, token_address: str) -> dict:
         """
@@ -33,9 +36,10 @@ class SafetyChecker:
         }
 
         try:
-            code = await self.w3.eth.get_code(
-                self.w3.to_checksum_address(token_address)
-            )
+            async with self._sem:
+                code = await self.w3.eth.get_code(
+                    self.w3.to_checksum_address(token_address)
+                )
         except Exception as e:
             result["safe"] = False
             result["reasons"].append(f"Failed to fetch bytecode: {e}")
@@ -3,10 +3,14 @@ In-memory token state tracker.
 Each discovered token gets a TokenState object tracking buys, volume, age, etc.
 Evicted after MAX_TOKEN_AGE_SECONDS to keep memory bounded.
 """
+import asyncio
 import time
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 
+import config
+
 logger = logging.getLogger("state")
 
 
@@ -37,7 +41,7 @@ class TokenState:
     ds_buys_m5: int | None = None
     ds_sells_m5: int | None = None
     ds_volume_m5: float | None = None
-    ds_last_fetch: float = 0.0
+    ds_last_fetch: float = 0.0  # time.monotonic() of the last DexScreener poll
 
     # Token identity (from DexScreener)
     token_name: str = ""
@@ -55,12 +59,20 @@ class TokenState:
     signal_time: float = 0.0
 
     # Swap timestamps for momentum detection
-    recent_buy_times: list = field(default_factory=list)
-    recent_sell_times: list = field(default_factory=list)
+    recent_buy_times: deque = field(default_factory=deque)
+    recent_sell_times: deque = field(default_factory=deque)
+    # Set by TokenStateTracker.record_buy once ≥ 2 buys landed within 30s
+    buy_burst_seen: bool = False
 
     # Dump alert state
     dump_alerted: bool = False
 
+    # Chain flag, derived once from dex_version (hot-path branch in the engine)
+    is_solana: bool = field(default=False, init=False)
+
+    def __post_init__(self):
+        self.is_solana = self.dex_version.startswith("solana")
+
     @property
     def age_seconds(self) -> float:
         return time.time() - self.first_seen
@@ -86,12 +98,19 @@ class TokenState:
             return max(self.total_buys, self.ds_buys_m5)
         return self.total_buys
 
+    def recent_sell_count(self, now: float) -> int:
+        """Sells in the last 60s. Drops expired timestamps from the head first,
+        so the count is O(expired) rather than a scan of the window."""
+        sell_times = self.recent_sell_times
+        cutoff = now - 60
+        while sell_times and sell_times[0] <= cutoff:
+            sell_times.popleft()
+        return len(sell_times)
+
     def has_momentum(self) -> bool:
         """Check optional momentum conditions (any one = True)."""
-        now = time.time()
-        # ≥ 2 buys within last 30 seconds
-        recent = [t for t in self.recent_buy_times if now - t <= 30]
-        if len(recent) >= 2:
+        # ≥ 2 buys within 30 seconds (latched by record_buy)
+        if self.buy_burst_seen:
             return True
         # Buy volume ≥ 20% of liquidity
         liq = self.best_liquidity
@@ -109,7 +128,11 @@ class TokenStateTracker:
     def __init__(self, max_age: int = 300):
         self.states: dict[str, TokenState] = {}
         self.max_age = max_age  # eviction TTL (seconds), slightly > signal window
-        self._deployer_history: dict[str, dict[str, float]] = {}  # deployer -> {token -> timestamp}
+        # deployer -> (deque of (timestamp, token) in arrival order, set of tokens in window)
+        self._deployer_history: dict[str, tuple[deque, set]] = {}
+        # Signaled states whose 60s sell count reached DUMP_SELL_THRESHOLD
+        # (set by main; each state is queued once)
+        self.dump_queue: asyncio.Queue | None = None
 
     def get(self, token_address: str) -> TokenState | None:
         """Get token state by address. Returns None if not found or expired (TTL enforced)."""
@@ -166,11 +189,17 @@ class TokenStateTracker:
         state.buy_volume_usd += amount_usd
         state.largest_buy_usd = max(state.largest_buy_usd, amount_usd)
         state.unique_buyers.add(buyer.lower())
-        state.recent_buy_times.append(time.time())
+        now = time.time()
+        buy_times = state.recent_buy_times
+        buy_times.append(now)
 
-        # Trim old timestamps (keep last 60s)
-        cutoff = time.time() - 60
-        state.recent_buy_times = [t for t in state.recent_buy_times if t > cutoff]
+        # Trim old timestamps (keep last 60s) — oldest are at the head
+        cutoff = now - 60
+        while buy_times and buy_times[0] <= cutoff:
+            buy_times.popleft()
+        # Latch the buy-burst momentum trigger so has_momentum() is O(1)
+        if len(buy_times) >= 2 and now - buy_times[-2] <= 30:
+            state.buy_burst_seen = True
 
         return state
 
@@ -180,10 +209,21 @@ class TokenStateTracker:
             return None
         state.total_sells += 1
         now = time.time()
-        state.recent_sell_times.append(now)
+        sell_times = state.recent_sell_times
+        sell_times.append(now)
         # Keep last 60s of sell timestamps
         cutoff = now - 60
-        state.recent_sell_times = [t for t in state.recent_sell_times if t > cutoff]
+        while sell_times and sell_times[0] <= cutoff:
+            sell_times.popleft()
+        # Event-driven dump detection: the threshold can only be crossed here
+        if (
+            self.dump_queue is not None
+            and state.signaled
+            and not state.dump_alerted
+            and len(sell_times) >= config.DUMP_SELL_THRESHOLD
+        ):
+            state.dump_alerted = True
+            self.dump_queue.put_nowait(state)
         return state
 
     def record_deployer(self, deployer: str, token_address: str) -> int:
@@ -191,25 +231,32 @@ class TokenStateTracker:
         Returns number of unique tokens by this deployer in last 24h."""
         addr = deployer.lower()
         now = time.time()
-        if addr not in self._deployer_history:
-            self._deployer_history[addr] = {}
+        history = self._deployer_history.get(addr)
+        if history is None:
+            history = self._deployer_history[addr] = (deque(), set())
+        order, tokens = history
         # Only record once per token (idempotent across multiple evaluate() calls)
-        if token_address not in self._deployer_history[addr]:
-            self._deployer_history[addr][token_address] = now
-        # Count unique tokens in last 24h
+        if token_address not in tokens:
+            order.append((now, token_address))
+            tokens.add(token_address)
+        # Count unique tokens in last 24h — expire from the oldest end
         cutoff = now - 86400
-        self._deployer_history[addr] = {
-            tok: ts for tok, ts in self._deployer_history[addr].items() if ts > cutoff
-        }
-        return len(self._deployer_history[addr])
+        while order and order[0][0] <= cutoff:
+            tokens.discard(order.popleft()[1])
+        return len(tokens)
 
     def evict_stale(self):
-        """Remove tokens older than max_age. Call periodically."""
-        stale = [
-            addr
-            for addr, state in self.states.items()
-            if state.age_seconds > self.max_age
-        ]
+        """Remove tokens older than max_age. Call periodically.
+
+        States are inserted by create() in first_seen order, so the dict's
+        insertion order is age order — stop at the first fresh entry.
+        """
+        cutoff = time.time() - self.max_age
+        stale = []
+        for addr, state in self.states.items():
+            if state.first_seen >= cutoff:
+                break
+            stale.append(addr)
         for addr in stale:
             del self.states[addr]
         if stale:
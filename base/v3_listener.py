@@ -18,13 +18,14 @@ from base.constants import (
     TOPIC_V3_POOL_CREATED,
     TOPIC_V3_SWAP,
     ETH_ADDRESSES,
+    ESTABLISHED_TOKENS,
     V3_POOL_ABI,
 )
 from base.price_utils import estimate_mcap, estimate_liquidity_usd
 
 logger = logging.getLogger("v3_listener")
 
-ALLOWED_FEE_TIERS = {3000, 10000}
+ALLOWED_FEE_TIERS = frozenset({3000, 10000})
 
 # Base L2 block time is ~2 seconds.  Poll slightly faster to ensure we don't
 # miss blocks even under jitter, but skip if no new block since last poll.
@@ -142,12 +143,15 @@ class V3Listener:
             return
 
         if t0 in ETH_ADDRESSES:
-            token_address = token1
+            token_address, token_lower = token1, t1
             eth_is_token0 = True
         else:
-            token_address = token0
+            token_address, token_lower = token0, t0
             eth_is_token0 = False
 
+        if token_lower in ESTABLISHED_TOKENS:
+            return
+
         logger.debug(
             f"[v3-pool] {token_address[:10]}.. pool={pool_addr[:10]}.. fee={fee}"
         )
@@ -160,7 +164,7 @@ class V3Listener:
             # EVM deployer spam is rare (gas cost), bytecode safety compensates.
         )
 
-        self.pool_to_token[pool_addr] = (token_address.lower(), eth_is_token0)
+        self.pool_to_token[pool_addr] = (token_lower, eth_is_token0)
         self._tracked_pools.add(pool_addr)
 
         # Push to discovery feed (personal bot — no auto-buy)
@@ -15,6 +15,7 @@ from base.constants import (
     TOPIC_V4_INITIALIZE,
     TOPIC_V4_SWAP,
     ETH_ADDRESSES,
+    ESTABLISHED_TOKENS,
     BLOCKED_HOOKS,
 )
 from base.price_utils import estimate_mcap, estimate_liquidity_usd
@@ -88,12 +89,15 @@ class V4Listener:
             return
 
         if c0 in ETH_ADDRESSES:
-            token_address = currency1
+            token_address, token_lower = currency1, c1
             eth_is_token0 = True
         else:
-            token_address = currency0
+            token_address, token_lower = currency0, c0
             eth_is_token0 = False
 
+        if token_lower in ESTABLISHED_TOKENS:
+            return
+
         # Format hooks address
         if isinstance(hooks_raw, bytes):
             hooks_lower = "0x" + hooks_raw.hex()
@@ -122,7 +126,7 @@ class V4Listener:
             # NOTE: deployer not extracted — would need extra eth_getTransaction RPC.
             # EVM deployer spam is rare (gas cost), bytecode safety compensates.
         )
-        self.pool_id_to_token[pool_id] = (token_address.lower(), eth_is_token0)
+        self.pool_id_to_token[pool_id] = (token_lower, eth_is_token0)
 
         # Push to discovery feed (personal bot — no auto-buy)
         if self.discovery_queue:
@@ -19,6 +19,8 @@ _wss_env = os.getenv("RPC_WSS_ENDPOINTS", "")
 RPC_WSS_ENDPOINTS: list[str] = [
     url.strip() for url in _wss_env.split(",") if url.strip()
 ] if _wss_env.strip() else [RPC_WSS]
+# Max bytecode safety-check RPC calls in flight (launch bursts queue behind this)
+SAFETY_RPC_CONCURRENCY = int(os.getenv("SAFETY_RPC_CONCURRENCY", "8"))
 
 # ── Telegram (Based Bot — Telethon userbot) ─────────────────
 TELEGRAM_API_ID = int(os.getenv("TELEGRAM_API_ID", "0"))
@@ -55,6 +57,10 @@ MIN_UNIQUE_BUYERS = int(os.getenv("MIN_UNIQUE_BUYERS", "2"))
 # Minimum swap USD value to trigger a whale alert on tracked tokens
 WHALE_ALERT_MIN_USD = float(os.getenv("WHALE_ALERT_MIN_USD", "500"))
 
+# ── Dump Alert ─────────────────────────────────────────────────
+# Sells within 60s on a signaled token that trigger a one-time dump alert
+DUMP_SELL_THRESHOLD = int(os.getenv("DUMP_SELL_THRESHOLD", "5"))
+
 # ── Discovery Feed ────────────────────────────────────────────
 # Shows every new WETH pair on personal bot (no auto-buy). Manual research.
 DISCOVERY_FEED_ENABLED = os.getenv("DISCOVERY_FEED_ENABLED", "true").lower() == "true"
@@ -65,6 +71,9 @@ DISCOVERY_MAX_PER_HOUR = int(os.getenv("DISCOVERY_MAX_PER_HOUR", "30"))
 # Set to 0 to disable (allow any latency within MAX_TOKEN_AGE_SECONDS).
 # Recommended: start at 0, then tighten to 90 after reviewing latency data.
 MAX_SIGNAL_LATENCY_SECONDS = int(os.getenv("MAX_SIGNAL_LATENCY_SECONDS", "0"))
+# ── Post-Mortem ───────────────────────────────────────────────
+# Number of recent post-mortem records kept in memory for stats.
+POST_MORTEM_HISTORY = int(os.getenv("POST_MORTEM_HISTORY", "2048"))
 # ── Solana ─────────────────────────────────────────────────────
 SOL_ENABLED = os.getenv("SOL_ENABLED", "false").lower() == "true"
 # Helius recommended (free tier: 100k credits/day). Public endpoint is unreliable.
@@ -73,6 +82,10 @@ SOL_RPC_HTTP = os.getenv("SOL_RPC_HTTP", "https://api.mainnet-beta.solana.com")
 # Solana-specific thresholds (faster chain = tighter windows)
 SOL_MAX_TOKEN_AGE_SECONDS = int(os.getenv("SOL_MAX_TOKEN_AGE_SECONDS", "120"))
 SOL_MIN_LIQUIDITY_SOL = float(os.getenv("SOL_MIN_LIQUIDITY_SOL", "10"))
+# Safety-check RPC pacing: sustained req/s, burst size, max requests in flight
+SOL_RPC_RATE = float(os.getenv("SOL_RPC_RATE", "10"))
+SOL_RPC_BURST = int(os.getenv("SOL_RPC_BURST", "20"))
+SOL_RPC_CONCURRENCY = int(os.getenv("SOL_RPC_CONCURRENCY", "8"))
 # ── Mode ───────────────────────────────────────────────────────
 DRY_RUN = os.getenv("DRY_RUN", "true").lower() == "true"
 
@@ -8,6 +8,8 @@ import logging
 import time
 import aiohttp
 
+import http_pool
+
 logger = logging.getLogger("dexscreener")
 
 # DexScreener API base
@@ -17,38 +19,66 @@ BASE_URL = "https://api.dexscreener.com"
 # We self-limit to ~200/min to stay safe
 MIN_REQUEST_INTERVAL = 0.3  # seconds between requests
 
+# /tokens/v1/{chain}/{addresses} accepts up to 30 comma-separated addresses
+MAX_TOKENS_PER_REQUEST = 30
+
+# Copycat checks search by symbol; launches reuse the same few symbols, so
+# search results are reused for this long
+SEARCH_CACHE_TTL = 60  # seconds
+
+# Applied per request so they also hold on an injected shared session
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=5)
+REQUEST_HEADERS = {"Accept": "application/json"}
+
+
+def _liquidity_usd(pair: dict) -> float:
+    """Pool liquidity in USD (DexScreener sends null for some pairs)."""
+    return (pair.get("liquidity") or {}).get("usd", 0)
+
+
+def _has_socials(pair: dict) -> bool:
+    """True if a DexScreener pair lists socials or websites."""
+    info = pair.get("info") or {}
+    return bool(info.get("socials") or info.get("websites"))
+
 
 class DexScreenerClient:
     """Async DexScreener API client for token enrichment."""
 
-    def __init__(self):
-        self._session: aiohttp.ClientSession | None = None
+    def __init__(self, session: aiohttp.ClientSession | None = None):
+        # Injected session (shared pool) is owned by the caller; otherwise
+        # we create and close our own
+        self._session = session
+        self._owns_session = session is None
         self._last_request: float = 0.0
+        # query -> (fetched_at, pairs), insertion order = fetch order
+        self._search_cache: dict[str, tuple[float, list[dict]]] = {}
         self._request_lock = asyncio.Lock()
 
     async def _ensure_session(self):
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=5),
-                headers={"Accept": "application/json"},
-            )
+            # Same keep-alive / DNS-cache pool settings as the shared session
+            self._session = http_pool.new_session()
+            self._owns_session = True
 
     async def close(self):
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def _rate_limited_get(self, url: str) -> dict | None:
         """GET with rate limiting."""
         async with self._request_lock:
-            now = time.time()
+            now = time.monotonic()
             wait = MIN_REQUEST_INTERVAL - (now - self._last_request)
             if wait > 0:
                 await asyncio.sleep(wait)
 
             await self._ensure_session()
             try:
-                async with self._session.get(url) as resp:
-                    self._last_request = time.time()
+                async with self._session.get(
+                    url, timeout=REQUEST_TIMEOUT, headers=REQUEST_HEADERS
+                ) as resp:
+                    self._last_request = time.monotonic()
                     if resp.status == 200:
                         return await resp.json()
                     elif resp.status == 429:
@@ -76,6 +106,34 @@ class DexScreenerClient:
             return data
         return []
 
+    async def get_tokens_pairs(
+        self, token_addresses: list[str], chain: str = "base"
+    ) -> dict[str, list[dict]]:
+        """
+        Fetch pairs for up to MAX_TOKENS_PER_REQUEST tokens in one request.
+        Returns {token_address: [pair, ...]} keyed by the addresses as passed;
+        tokens with no pairs are absent.
+        """
+        url = f"{BASE_URL}/tokens/v1/{chain}/{','.join(token_addresses)}"
+        data = await self._rate_limited_get(url)
+        if not isinstance(data, list):
+            return {}
+        # EVM addresses compare case-insensitively; Solana base58 is exact
+        if chain == "solana":
+            wanted = {a: a for a in token_addresses}
+        else:
+            wanted = {a.lower(): a for a in token_addresses}
+        result: dict[str, list[dict]] = {}
+        for pair in data:
+            for side in ("baseToken", "quoteToken"):
+                addr = (pair.get(side) or {}).get("address", "")
+                if chain != "solana":
+                    addr = addr.lower()
+                token = wanted.get(addr)
+                if token is not None:
+                    result.setdefault(token, []).append(pair)
+        return result
+
     async def get_pair(self, pair_address: str) -> dict | None:
         """Fetch a specific pair by address on Base."""
         url = f"{BASE_URL}/latest/dex/pairs/base/{pair_address}"
@@ -95,12 +153,27 @@ class DexScreenerClient:
     async def search_pairs(self, query: str) -> list[dict]:
         """Search for pairs matching a query (symbol, name, address).
         Returns list of pair objects sorted by relevance.
+        Results are cached for SEARCH_CACHE_TTL seconds per query.
         Rate limit: 300 req/min."""
+        now = time.monotonic()
+        cache = self._search_cache
+        # Drop expired entries from the head (oldest fetches first)
+        while cache:
+            oldest = next(iter(cache))
+            if now - cache[oldest][0] < SEARCH_CACHE_TTL:
+                break
+            del cache[oldest]
+        hit = cache.get(query)
+        if hit is not None:
+            return hit[1]
+
         url = f"{BASE_URL}/latest/dex/search?q={query}"
         data = await self._rate_limited_get(url)
-        if data and "pairs" in data:
-            return data["pairs"]
-        return []
+        if data is None:
+            return []  # request failed — don't cache
+        pairs = data.get("pairs") or []
+        cache[query] = (time.monotonic(), pairs)
+        return pairs
 
 
 class DexScreenerEnricher:
@@ -137,7 +210,9 @@ class DexScreenerEnricher:
 
     async def _enrich_cycle(self):
         """Enrich all active (non-signaled, non-stale) tokens."""
-        now = time.time()
+        # Poll bookkeeping is monotonic; token age (first_seen) and
+        # pairCreatedAt stay wall-clock since they come from outside
+        now = time.monotonic()
         tokens_to_enrich = []
 
         for addr, state in list(self.tracker.states.items()):
@@ -155,55 +230,53 @@ class DexScreenerEnricher:
 
         logger.debug(f"Enriching {len(tokens_to_enrich)} tokens via DexScreener")
 
-        for addr in tokens_to_enrich:
-            state = self.tracker.get(addr)
-            if state is None or state.signaled:
-                continue
-
-            pairs = await self.client.get_token_pairs(addr)
-            if not pairs:
-                continue
-
-            # Use the pair with highest liquidity
-            best_pair = max(pairs, key=lambda p: (p.get("liquidity") or {}).get("usd", 0))
-
-            # Extract data
-            liquidity = best_pair.get("liquidity", {})
-            state.ds_liquidity_usd = liquidity.get("usd")
-            state.ds_mcap = best_pair.get("marketCap") or best_pair.get("fdv")
-
-            txns = best_pair.get("txns", {})
-            m5 = txns.get("m5", {})
-            state.ds_buys_m5 = m5.get("buys")
-            state.ds_sells_m5 = m5.get("sells")
-
-            volume = best_pair.get("volume", {})
-            state.ds_volume_m5 = volume.get("m5")
-
-            # Token identity (first enrichment only)
-            if not state.token_symbol:
-                base_token = best_pair.get("baseToken", {})
-                state.token_name = base_token.get("name", "")
-                state.token_symbol = base_token.get("symbol", "")
-                state.pair_created_at = best_pair.get("pairCreatedAt", 0)
-                info = best_pair.get("info", {})
-                socials = info.get("socials", [])
-                websites = info.get("websites", [])
-                state.has_socials = bool(socials or websites)
-
-                # Copycat check: search for this symbol across all chains
-                if state.token_symbol and not state.is_copycat:
-                    await self._check_copycat(state, best_pair)
-
-            state.ds_last_fetch = time.time()
+        for start in range(0, len(tokens_to_enrich), MAX_TOKENS_PER_REQUEST):
+            chunk = tokens_to_enrich[start:start + MAX_TOKENS_PER_REQUEST]
+            pairs_by_token = await self.client.get_tokens_pairs(chunk)
+            for addr in chunk:
+                state = self.tracker.get(addr)
+                if state is None or state.signaled:
+                    continue
 
-            logger.debug(
-                f"[ds] {addr[:10]}... mcap=${state.ds_mcap} liq=${state.ds_liquidity_usd} "
-                f"buys={state.ds_buys_m5} sells={state.ds_sells_m5}"
-            )
+                pairs = pairs_by_token.get(addr)
+                if not pairs:
+                    continue
 
-            # Re-evaluate signal with enriched data
-            await self.engine.evaluate(state)
+                # Use the pair with highest liquidity
+                best_pair = max(pairs, key=_liquidity_usd)
+
+                # Extract data
+                # One walk per nested block; null blocks fall back to {}
+                liquidity = best_pair.get("liquidity") or {}
+                txns_m5 = (best_pair.get("txns") or {}).get("m5") or {}
+                volume = best_pair.get("volume") or {}
+                state.ds_liquidity_usd = liquidity.get("usd")
+                state.ds_mcap = best_pair.get("marketCap") or best_pair.get("fdv")
+                state.ds_buys_m5 = txns_m5.get("buys")
+                state.ds_sells_m5 = txns_m5.get("sells")
+                state.ds_volume_m5 = volume.get("m5")
+
+                # Token identity (first enrichment only)
+                if not state.token_symbol:
+                    base_token = best_pair.get("baseToken", {})
+                    state.token_name = base_token.get("name", "")
+                    state.token_symbol = base_token.get("symbol", "")
+                    state.pair_created_at = best_pair.get("pairCreatedAt", 0)
+                    state.has_socials = _has_socials(best_pair)
+
+                    # Copycat check: search for this symbol across all chains
+                    if state.token_symbol and not state.is_copycat:
+                        await self._check_copycat(state, best_pair)
+
+                state.ds_last_fetch = time.monotonic()
+
+                logger.debug(
+                    f"[ds] {addr[:10]}... mcap=${state.ds_mcap} liq=${state.ds_liquidity_usd} "
+                    f"buys={state.ds_buys_m5} sells={state.ds_sells_m5}"
+                )
+
+                # Re-evaluate signal with enriched data
+                await self.engine.evaluate(state)
 
     async def _check_copycat(self, state, our_pair: dict):
         """Check if token symbol is a copycat of an established token.
@@ -217,22 +290,21 @@ class DexScreenerEnricher:
             if not results:
                 return
 
-            our_liq = (our_pair.get("liquidity") or {}).get("usd", 0)
+            our_liq = _liquidity_usd(our_pair)
             our_addr = state.token_address.lower()
+            our_symbol = state.token_symbol.upper()
+            we_have_socials = state.has_socials
 
             for pair in results:
                 base = pair.get("baseToken", {})
                 # Must match symbol exactly (case-insensitive)
-                if base.get("symbol", "").upper() != state.token_symbol.upper():
+                if base.get("symbol", "").upper() != our_symbol:
                     continue
                 # Skip our own token
                 if base.get("address", "").lower() == our_addr:
                     continue
                 # Check if this other token is established
-                other_liq = (pair.get("liquidity") or {}).get("usd", 0)
-                other_mcap = pair.get("marketCap") or pair.get("fdv") or 0
-                other_info = pair.get("info", {})
-                other_socials = bool(other_info.get("socials") or other_info.get("websites"))
+                other_liq = _liquidity_usd(pair)
 
                 # Rule 1: other token has 10x+ our liquidity → copycat
                 if our_liq > 0 and other_liq > our_liq * 10:
@@ -244,7 +316,8 @@ class DexScreenerEnricher:
                     return
 
                 # Rule 2: other token has socials + >2x liq, we don't → copycat
-                if other_socials and not state.has_socials and other_liq > our_liq * 2:
+                # (cheap numeric checks first, nested info lookup last)
+                if not we_have_socials and other_liq > our_liq * 2 and _has_socials(pair):
                     state.is_copycat = True
                     logger.info(
                         f"[copycat] {state.token_symbol} {our_addr[:12]}.. "
@@ -253,6 +326,7 @@ class DexScreenerEnricher:
                     return
 
                 # Rule 3: other token has >$100k mcap → well-established, we're fake
+                other_mcap = pair.get("marketCap") or pair.get("fdv") or 0
                 if other_mcap > 100_000 and our_liq < 50_000:
                     state.is_copycat = True
                     logger.info(
@@ -300,7 +374,7 @@ class SolDexScreenerEnricher:
             await self.client.close()
 
     async def _enrich_cycle(self):
-        now = time.time()
+        now = time.monotonic()
         tokens_to_enrich = []
 
         for addr, state in list(self.tracker.states.items()):
@@ -319,56 +393,51 @@ class SolDexScreenerEnricher:
             f"Enriching {len(tokens_to_enrich)} Solana tokens via DexScreener"
         )
 
-        for addr in tokens_to_enrich:
-            state = self.tracker.get(addr)
-            if state is None or state.signaled:
-                continue
-
-            pairs = await self.client.get_token_pairs(addr, chain="solana")
-            if not pairs:
-                continue
-
-            best_pair = max(
-                pairs,
-                key=lambda p: (p.get("liquidity") or {}).get("usd", 0),
-            )
+        for start in range(0, len(tokens_to_enrich), MAX_TOKENS_PER_REQUEST):
+            chunk = tokens_to_enrich[start:start + MAX_TOKENS_PER_REQUEST]
+            pairs_by_token = await self.client.get_tokens_pairs(chunk, chain="solana")
+            for addr in chunk:
+                state = self.tracker.get(addr)
+                if state is None or state.signaled:
+                    continue
 
-            liquidity = best_pair.get("liquidity", {})
-            state.ds_liquidity_usd = liquidity.get("usd")
-            state.ds_mcap = best_pair.get("marketCap") or best_pair.get("fdv")
+                pairs = pairs_by_token.get(addr)
+                if not pairs:
+                    continue
 
-            txns = best_pair.get("txns", {})
-            m5 = txns.get("m5", {})
-            state.ds_buys_m5 = m5.get("buys")
-            state.ds_sells_m5 = m5.get("sells")
+                best_pair = max(pairs, key=_liquidity_usd)
 
-            volume = best_pair.get("volume", {})
-            state.ds_volume_m5 = volume.get("m5")
+                # One walk per nested block; null blocks fall back to {}
+                liquidity = best_pair.get("liquidity") or {}
+                txns_m5 = (best_pair.get("txns") or {}).get("m5") or {}
+                volume = best_pair.get("volume") or {}
+                state.ds_liquidity_usd = liquidity.get("usd")
+                state.ds_mcap = best_pair.get("marketCap") or best_pair.get("fdv")
+                state.ds_buys_m5 = txns_m5.get("buys")
+                state.ds_sells_m5 = txns_m5.get("sells")
+                state.ds_volume_m5 = volume.get("m5")
 
-            # Token identity (first enrichment only)
-            if not state.token_symbol:
-                base_token = best_pair.get("baseToken", {})
-                state.token_name = base_token.get("name", "")
-                state.token_symbol = base_token.get("symbol", "")
-                state.pair_created_at = best_pair.get("pairCreatedAt", 0)
-                info = best_pair.get("info", {})
-                socials = info.get("socials", [])
-                websites = info.get("websites", [])
-                state.has_socials = bool(socials or websites)
+                # Token identity (first enrichment only)
+                if not state.token_symbol:
+                    base_token = best_pair.get("baseToken", {})
+                    state.token_name = base_token.get("name", "")
+                    state.token_symbol = base_token.get("symbol", "")
+                    state.pair_created_at = best_pair.get("pairCreatedAt", 0)
+                    state.has_socials = _has_socials(best_pair)
 
-                # Copycat check
-                if state.token_symbol and not state.is_copycat:
-                    await self._check_copycat_sol(state, best_pair)
+                    # Copycat check
+                    if state.token_symbol and not state.is_copycat:
+                        await self._check_copycat_sol(state, best_pair)
 
-            state.ds_last_fetch = time.time()
+                state.ds_last_fetch = time.monotonic()
 
-            logger.debug(
-                f"[sol-ds] {addr[:8]}... mcap=${state.ds_mcap} "
-                f"liq=${state.ds_liquidity_usd} "
-                f"buys={state.ds_buys_m5} sells={state.ds_sells_m5}"
-            )
+                logger.debug(
+                    f"[sol-ds] {addr[:8]}... mcap=${state.ds_mcap} "
+                    f"liq=${state.ds_liquidity_usd} "
+                    f"buys={state.ds_buys_m5} sells={state.ds_sells_m5}"
+                )
 
-            await self.engine.evaluate(state)
+                await self.engine.evaluate(state)
 
     async def _check_copycat_sol(self, state, our_pair: dict):
         """Copycat check for Solana tokens (same logic as EVM)."""
@@ -377,19 +446,18 @@ class SolDexScreenerEnricher:
             if not results:
                 return
 
-            our_liq = (our_pair.get("liquidity") or {}).get("usd", 0)
+            our_liq = _liquidity_usd(our_pair)
             our_addr = state.token_address.lower()
+            our_symbol = state.token_symbol.upper()
+            we_have_socials = state.has_socials
 
             for pair in results:
                 base = pair.get("baseToken", {})
-                if base.get("symbol", "").upper() != state.token_symbol.upper():
+                if base.get("symbol", "").upper() != our_symbol:
                     continue
                 if base.get("address", "").lower() == our_addr:
                     continue
-                other_liq = (pair.get("liquidity") or {}).get("usd", 0)
-                other_mcap = pair.get("marketCap") or pair.get("fdv") or 0
-                other_info = pair.get("info", {})
-                other_socials = bool(other_info.get("socials") or other_info.get("websites"))
+                other_liq = _liquidity_usd(pair)
 
                 if our_liq > 0 and other_liq > our_liq * 10:
                     state.is_copycat = True
@@ -398,12 +466,13 @@ class SolDexScreenerEnricher:
                         f"liq=${our_liq:,.0f} vs ${other_liq:,.0f}"
                     )
                     return
-                if other_socials and not state.has_socials and other_liq > our_liq * 2:
+                if not we_have_socials and other_liq > our_liq * 2 and _has_socials(pair):
                     state.is_copycat = True
                     logger.info(
                         f"[copycat] sol {state.token_symbol} no socials vs verified"
                     )
                     return
+                other_mcap = pair.get("marketCap") or pair.get("fdv") or 0
                 if other_mcap > 100_000 and our_liq < 50_000:
                     state.is_copycat = True
                     logger.info(
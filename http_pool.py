@@ -0,0 +1,73 @@
+"""
+Shared aiohttp session for outbound HTTP (Telegram Bot API, Solana RPC).
+
+One connection pool for the whole process: DNS results and keep-alive
+connections are reused across components instead of each class paying
+its own TLS handshakes. JSON request bodies are encoded with orjson.
+
+Usage:
+    session = http_pool.get_session()      # shared, created on first use
+    bot = SignalBot(queue, session=session)
+    ...
+    await http_pool.close()                # on shutdown
+"""
+import logging
+
+import aiohttp
+import orjson
+
+logger = logging.getLogger("http_pool")
+
+POOL_LIMIT = 128
+POOL_LIMIT_PER_HOST = 16  # Telegram sends and RPC calls each stay well under this
+DNS_CACHE_TTL = 600       # seconds
+KEEPALIVE_TIMEOUT = 75    # seconds an idle connection stays open
+REQUEST_TIMEOUT = 10      # seconds, total per request
+CONNECT_TIMEOUT = 3       # seconds to get a connection (incl. TLS)
+READ_TIMEOUT = 7          # seconds between socket reads
+
+_session: aiohttp.ClientSession | None = None
+
+
+def _json_dumps(obj) -> str:
+    # aiohttp's json_serialize must return str
+    return orjson.dumps(obj).decode()
+
+
+def new_session(**kwargs) -> aiohttp.ClientSession:
+    """Create a session with the pool defaults. Must be called inside the event loop."""
+    kwargs.setdefault(
+        "connector",
+        aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ),
+    )
+    kwargs.setdefault(
+        "timeout",
+        aiohttp.ClientTimeout(
+            total=REQUEST_TIMEOUT,
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT,
+        ),
+    )
+    kwargs.setdefault("json_serialize", _json_dumps)
+    return aiohttp.ClientSession(**kwargs)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = new_session()
+    return _session
+
+
+async def close():
+    """Close the shared session (idempotent)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
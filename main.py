@@ -10,15 +10,19 @@ Usage:
     DRY_RUN=true python main.py # dry run (no Telegram sends)
 """
 import asyncio
+import atexit
+import heapq
 import logging
 import signal as signal_module
 import sys
 import time
 
+import aiohttp
 from web3 import AsyncWeb3
 from web3.providers import WebSocketProvider
 
 import config
+import http_pool
 from base.constants import WETH
 from base.state import TokenStateTracker
 from base.v4_listener import V4Listener
@@ -28,13 +32,13 @@ from signal_engine import SignalEngine
 from dexscreener import DexScreenerClient, DexScreenerEnricher, SolDexScreenerEnricher
 from telegram_sender import TelegramSender
 from telegram_bot import SignalBot
-from post_mortem import PostMortemTracker
+from post_mortem import PostMortemRecord, PostMortemTracker
 
 # Solana imports (conditional on SOL_ENABLED)
 if config.SOL_ENABLED:
     from solana.state import SolTokenStateTracker
     from solana.listener import SolanaListener
-    from solana.safety import SolSafetyChecker, run_sol_safety_check
+    from solana.safety import SolSafetyChecker, run_sol_safety_check, run_sol_safety_checks
 
 # ── Logging ──
 logging.basicConfig(
@@ -48,6 +52,9 @@ logging.getLogger("web3").setLevel(logging.WARNING)
 logging.getLogger("asyncio").setLevel(logging.WARNING)
 logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
+# Price lookups go through the shared HTTP pool with a tighter per-request cap
+PRICE_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
 
 class EthPriceOracle:
     """Fetches ETH/USD price via DexScreener. Refreshes every 60s."""
@@ -57,24 +64,20 @@ class EthPriceOracle:
 
     async def update(self):
         try:
-            import aiohttp
-
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=5)
-            ) as session:
-                url = f"https://api.dexscreener.com/tokens/v1/base/{WETH}"
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if isinstance(data, list):
-                            for pair in data:
-                                qt = pair.get("quoteToken", {})
-                                if qt.get("symbol") in ("USDC", "USDbC"):
-                                    price_str = pair.get("priceUsd")
-                                    if price_str:
-                                        self.price = float(price_str)
-                                        logger.debug(f"ETH price: ${self.price:,.0f}")
-                                        return
+            session = http_pool.get_session()
+            url = f"https://api.dexscreener.com/tokens/v1/base/{WETH}"
+            async with session.get(url, timeout=PRICE_FETCH_TIMEOUT) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    if isinstance(data, list):
+                        for pair in data:
+                            qt = pair.get("quoteToken", {})
+                            if qt.get("symbol") in ("USDC", "USDbC"):
+                                price_str = pair.get("priceUsd")
+                                if price_str:
+                                    self.price = float(price_str)
+                                    logger.debug(f"ETH price: ${self.price:,.0f}")
+                                    return
         except Exception as e:
             logger.debug(f"ETH price fetch failed: {e}")
 
@@ -95,38 +98,34 @@ class SolPriceOracle:
 
     async def update(self):
         try:
-            import aiohttp
-
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=5)
-            ) as session:
-                url = "https://api.dexscreener.com/tokens/v1/solana/So11111111111111111111111111111111111111112"
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if isinstance(data, list):
-                            for pair in data:
-                                # Only use pairs where WSOL is the base token
-                                bt = pair.get("baseToken", {})
-                                if bt.get("address") != "So11111111111111111111111111111111111111112":
-                                    continue
-                                # Prefer stablecoin-quoted pairs for accuracy
-                                qt = pair.get("quoteToken", {})
-                                if qt.get("symbol") in ("USDC", "USDT"):
-                                    price_str = pair.get("priceUsd")
-                                    if price_str:
-                                        self.price = float(price_str)
-                                        logger.debug(f"SOL price: ${self.price:,.2f}")
-                                        return
-                            # Fallback: any pair where WSOL is base
-                            for pair in data:
-                                bt = pair.get("baseToken", {})
-                                if bt.get("address") == "So11111111111111111111111111111111111111112":
-                                    price_str = pair.get("priceUsd")
-                                    if price_str:
-                                        self.price = float(price_str)
-                                        logger.debug(f"SOL price (fallback): ${self.price:,.2f}")
-                                        return
+            session = http_pool.get_session()
+            url = "https://api.dexscreener.com/tokens/v1/solana/So11111111111111111111111111111111111111112"
+            async with session.get(url, timeout=PRICE_FETCH_TIMEOUT) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    if isinstance(data, list):
+                        for pair in data:
+                            # Only use pairs where WSOL is the base token
+                            bt = pair.get("baseToken", {})
+                            if bt.get("address") != "So11111111111111111111111111111111111111112":
+                                continue
+                            # Prefer stablecoin-quoted pairs for accuracy
+                            qt = pair.get("quoteToken", {})
+                            if qt.get("symbol") in ("USDC", "USDT"):
+                                price_str = pair.get("priceUsd")
+                                if price_str:
+                                    self.price = float(price_str)
+                                    logger.debug(f"SOL price: ${self.price:,.2f}")
+                                    return
+                        # Fallback: any pair where WSOL is base
+                        for pair in data:
+                            bt = pair.get("baseToken", {})
+                            if bt.get("address") == "So11111111111111111111111111111111111111112":
+                                price_str = pair.get("priceUsd")
+                                if price_str:
+                                    self.price = float(price_str)
+                                    logger.debug(f"SOL price (fallback): ${self.price:,.2f}")
+                                    return
         except Exception as e:
             logger.debug(f"SOL price fetch failed: {e}")
 
@@ -145,19 +144,28 @@ class SignalDetector:
     def __init__(self):
         # ── EVM ───────────────────────────────────────────────
         self.state_tracker = TokenStateTracker(max_age=300)
+        # Dump alerts: trackers queue signaled tokens whose sells spike
+        self._dump_queue: asyncio.Queue = asyncio.Queue()
+        self.state_tracker.dump_queue = self._dump_queue
 
         # ── Solana (optional) ─────────────────────────────────
         self.sol_state_tracker = (
             SolTokenStateTracker(max_age=200) if config.SOL_ENABLED else None
         )
+        if self.sol_state_tracker:
+            self.sol_state_tracker.dump_queue = self._dump_queue
 
         # ── Shared engine (both chains push to same signal_queue) ──
         self.engine = SignalEngine(
             state_tracker=self.state_tracker,
             sol_state_tracker=self.sol_state_tracker,
         )
+        # Shared HTTP pool for DexScreener, the Bot API and Solana RPC
+        # (keep-alive + DNS cache)
+        self._http = http_pool.get_session()
         self.eth_oracle = EthPriceOracle()
-        self._shared_dex_client = DexScreenerClient()  # single client for all DexScreener calls
+        # single client for all DexScreener calls
+        self._shared_dex_client = DexScreenerClient(session=self._http)
         self.dex_enricher = DexScreenerEnricher(self.state_tracker, self.engine, client=self._shared_dex_client)
         self.post_mortem = PostMortemTracker(
             dex_client=self._shared_dex_client,
@@ -181,6 +189,7 @@ class SignalDetector:
             sol_state_tracker=self.sol_state_tracker,
             whale_queue=self._whale_queue,
             discovery_queue=self._discovery_queue,
+            session=self._http,
         )
 
         self.w3 = None
@@ -255,6 +264,7 @@ class SignalDetector:
                 asyncio.create_task(self.post_mortem.start(), name="post_mortem"),
                 asyncio.create_task(self._signal_hook_loop(), name="signal_hook"),
                 asyncio.create_task(self._dump_monitor_loop(), name="dump_monitor"),
+                asyncio.create_task(self.engine.journal.run_flush_loop(), name="journal_flush"),
                 # V3 swap polling — replaces global swap subscription, saves ~70% credits
                 asyncio.create_task(self._v3.poll_swaps(), name="v3_swap_poll"),
             ]
@@ -263,7 +273,8 @@ class SignalDetector:
 
             # ── Add Solana tasks if enabled ────────────────────
             if config.SOL_ENABLED:
-                self.sol_safety = SolSafetyChecker(config.SOL_RPC_HTTP)
+                self.sol_safety = SolSafetyChecker(config.SOL_RPC_HTTP, session=self._http)
+                await self.sol_safety.start()
                 self.sol_listener = SolanaListener(
                     wss_url=config.SOL_RPC_WSS,
                     http_url=config.SOL_RPC_HTTP,
@@ -304,7 +315,7 @@ class SignalDetector:
             for task in pending:
                 task.cancel()
 
-    async def _on_post_mortem(self, record: dict):
+    async def _on_post_mortem(self, record: PostMortemRecord):
         """Forward post-mortem results to personal bot."""
         if self.signal_bot:
             await self.signal_bot.send_post_mortem(record)
@@ -359,56 +370,31 @@ class SignalDetector:
             await asyncio.sleep(2)
 
     async def _dump_monitor_loop(self):
-        """Monitor signaled tokens for rapid sell-offs. Alert once per token."""
-        SELL_THRESHOLD = 5   # sells in last 60s to trigger alert
+        """Send dump alerts for signaled tokens queued by the trackers' record_sell.
+        Each token is queued at most once (state.dump_alerted)."""
         while True:
+            state = await self._dump_queue.get()
             try:
-                # EVM
-                for addr, state in list(self.state_tracker.states.items()):
-                    if not state.signaled or state.dump_alerted:
-                        continue
-                    now = time.time()
-                    sells_60s = len([t for t in state.recent_sell_times if now - t <= 60])
-                    if sells_60s >= SELL_THRESHOLD:
-                        state.dump_alerted = True
-                        logger.info(
-                            f"[dump] {addr[:12]}.. sells_60s={sells_60s} "
-                            f"S/B={state.total_sells}/{state.total_buys}"
-                        )
-                        await self.signal_bot.send_dump_alert(
-                            token_address=addr,
-                            chain="base",
-                            sells_60s=sells_60s,
-                            total_sells=state.total_sells,
-                            total_buys=state.best_buys,
-                            mcap=state.best_mcap,
-                            liq=state.best_liquidity,
-                        )
-                # Solana
-                if self.sol_state_tracker:
-                    for addr, state in list(self.sol_state_tracker.states.items()):
-                        if not state.signaled or state.dump_alerted:
-                            continue
-                        now = time.time()
-                        sells_60s = len([t for t in state.recent_sell_times if now - t <= 60])
-                        if sells_60s >= SELL_THRESHOLD:
-                            state.dump_alerted = True
-                            logger.info(
-                                f"[dump] sol {addr[:12]}.. sells_60s={sells_60s} "
-                                f"S/B={state.total_sells}/{state.total_buys}"
-                            )
-                            await self.signal_bot.send_dump_alert(
-                                token_address=addr,
-                                chain="solana",
-                                sells_60s=sells_60s,
-                                total_sells=state.total_sells,
-                                total_buys=state.best_buys,
-                                mcap=state.best_mcap,
-                                liq=state.best_liquidity,
-                            )
+                sells_60s = state.recent_sell_count(time.time())
+                chain = "solana" if state.is_solana else "base"
+                logger.info(
+                    f"[dump]{' sol' if state.is_solana else ''} "
+                    f"{state.token_address[:12]}.. sells_60s={sells_60s} "
+                    f"S/B={state.total_sells}/{state.total_buys}"
+                )
+                await self.signal_bot.send_dump_alert(
+                    token_address=state.token_address,
+                    chain=chain,
+                    sells_60s=sells_60s,
+                    total_sells=state.total_sells,
+                    total_buys=state.best_buys,
+                    mcap=state.best_mcap,
+                    liq=state.best_liquidity,
+                )
             except Exception as e:
                 logger.error(f"Dump monitor error: {e}")
-            await asyncio.sleep(5)
+            finally:
+                self._dump_queue.task_done()
 
     async def _eviction_loop(self):
         while True:
@@ -457,19 +443,30 @@ class SignalDetector:
 
     async def _sol_safety_loop(self):
         """Run mint/freeze authority checks for new Solana tokens."""
-        checked: set[str] = set()
+        # Mints with a check in flight. A check that comes back unknown (RPC
+        # error, mint not visible yet) leaves bytecode_safe None, so the
+        # token is picked up again on a later pass.
+        in_flight: set[str] = set()
         while True:
             if self.sol_state_tracker and self.sol_safety:
-                for addr, state in list(self.sol_state_tracker.states.items()):
-                    if addr in checked or state.bytecode_safe is not None:
-                        checked.add(addr)
-                        continue
-                    asyncio.create_task(
-                        run_sol_safety_check(self.sol_safety, state)
-                    )
-                    checked.add(addr)
-                # Prune checked set: remove addresses no longer in tracker (evicted)
-                checked &= set(self.sol_state_tracker.states.keys())
+                # Everything that arrived since the last pass goes out as one
+                # getMultipleAccounts batch instead of one RPC per mint
+                pending = [
+                    state for addr, state in list(self.sol_state_tracker.states.items())
+                    if state.bytecode_safe is None and addr not in in_flight
+                ]
+                if pending:
+                    addrs = [state.token_address for state in pending]
+                    in_flight.update(addrs)
+                    if len(pending) == 1:
+                        task = asyncio.create_task(
+                            run_sol_safety_check(self.sol_safety, pending[0])
+                        )
+                    else:
+                        task = asyncio.create_task(
+                            run_sol_safety_checks(self.sol_safety, pending)
+                        )
+                    task.add_done_callback(lambda _, a=addrs: in_flight.difference_update(a))
             await asyncio.sleep(2)
 
     async def _stats_loop(self):
@@ -499,12 +496,14 @@ class SignalDetector:
                     f"tp={stats['tp_hit_rate']} rug={stats['rug_rate']}"
                 )
             if stats["reject_reasons"]:
-                top = sorted(stats["reject_reasons"].items(), key=lambda x: -x[1])[:5]
+                top = heapq.nlargest(5, stats["reject_reasons"].items(), key=lambda x: x[1])
                 logger.info(f"[stats] rejects: {dict(top)}")
 
 
 async def main():
     detector = SignalDetector()
+    # _shutdown() closes the journal on SIGINT/SIGTERM; this covers every other exit
+    atexit.register(detector.engine.journal.close)
     loop = asyncio.get_event_loop()
     for sig in (signal_module.SIGINT, signal_module.SIGTERM):
         loop.add_signal_handler(sig, lambda: asyncio.create_task(_shutdown(detector)))
@@ -560,9 +559,12 @@ async def _shutdown(detector: SignalDetector):
         await detector.sol_listener.stop()
     if detector.sol_safety:
         await detector.sol_safety.close()
-    # Close shared DexScreener client last
+    # Flush buffered journal lines before exit
+    detector.engine.journal.close()
+    # Close shared DexScreener client and HTTP pool last
     if detector._shared_dex_client:
         await detector._shared_dex_client.close()
+    await http_pool.close()
     logger.info("Goodbye.")
     # Cancel all running tasks for clean exit
     for task in asyncio.all_tasks():
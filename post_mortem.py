@@ -8,10 +8,36 @@ This data is essential for false-positive auditing and threshold tuning.
 import asyncio
 import logging
 import time
+from dataclasses import dataclass
 
 logger = logging.getLogger("postmortem")
 
 
+@dataclass(slots=True)
+class PendingEntry:
+    """A signaled token waiting for its follow-up check."""
+    token: str
+    signal_time: float       # wall clock, for records
+    signal_mono: float       # monotonic, for the follow-up timer
+    mcap_at_signal: float
+    latency_s: float
+    chain: str = "base"
+
+
+@dataclass(slots=True)
+class PostMortemRecord:
+    """Outcome of a signaled token after the follow-up window."""
+    token: str
+    chain: str
+    latency_s: float
+    mcap_at_signal: float
+    mcap_10m: float
+    liq_10m: float
+    price_change_pct: float
+    follow_up_time: float
+    outcome: str = ""
+
+
 class PostMortemTracker:
     """
     Watches signaled tokens and records their 10-minute performance.
@@ -22,19 +48,20 @@ class PostMortemTracker:
         self.dex_client = dex_client
         self.engine = signal_engine
         self.follow_up_seconds = follow_up_seconds
-        self._pending: list[dict] = []  # tokens awaiting follow-up
+        self._pending: list[PendingEntry] = []  # tokens awaiting follow-up
         self._running = False
-        self._on_complete = on_complete  # async callback(record) for notifications
+        self._on_complete = on_complete  # async callback(PostMortemRecord) for notifications
 
     def schedule(self, token_address: str, mcap_at_signal: float, latency: float, chain: str = "base"):
         """Schedule a post-mortem check for a token that just signaled."""
-        self._pending.append({
-            "token": token_address,
-            "signal_time": time.time(),
-            "mcap_at_signal": mcap_at_signal,
-            "latency_s": latency,
-            "chain": chain,
-        })
+        self._pending.append(PendingEntry(
+            token=token_address,
+            signal_time=time.time(),
+            signal_mono=time.monotonic(),
+            mcap_at_signal=mcap_at_signal,
+            latency_s=latency,
+            chain=chain,
+        ))
         logger.debug(
             f"[pm-scheduled] {token_address[:10]}... "
             f"check in {self.follow_up_seconds}s"
@@ -60,11 +87,11 @@ class PostMortemTracker:
 
     async def _check_cycle(self):
         """Check if any pending tokens are ready for follow-up."""
-        now = time.time()
+        now = time.monotonic()
         still_pending = []
 
         for entry in self._pending:
-            elapsed = now - entry["signal_time"]
+            elapsed = now - entry.signal_mono
             if elapsed < self.follow_up_seconds:
                 still_pending.append(entry)
                 continue
@@ -74,11 +101,11 @@ class PostMortemTracker:
 
         self._pending = still_pending
 
-    async def _do_follow_up(self, entry: dict):
+    async def _do_follow_up(self, entry: PendingEntry):
         """Fetch current DexScreener data and record post-mortem."""
-        token = entry["token"]
-        mcap_at_signal = entry["mcap_at_signal"]
-        chain = entry.get("chain", "base")
+        token = entry.token
+        mcap_at_signal = entry.mcap_at_signal
+        chain = entry.chain
 
         pairs = await self.dex_client.get_token_pairs(token, chain=chain)
 
@@ -101,30 +128,30 @@ class PostMortemTracker:
         else:
             price_change_pct = 0.0
 
-        record = {
-            "token": token,
-            "chain": chain,
-            "latency_s": entry["latency_s"],
-            "mcap_at_signal": mcap_at_signal,
-            "mcap_10m": mcap_now,
-            "liq_10m": liq_now,
-            "price_change_pct": price_change_pct,
-            "follow_up_time": time.time(),
-        }
+        record = PostMortemRecord(
+            token=token,
+            chain=chain,
+            latency_s=entry.latency_s,
+            mcap_at_signal=mcap_at_signal,
+            mcap_10m=mcap_now,
+            liq_10m=liq_now,
+            price_change_pct=price_change_pct,
+            follow_up_time=time.time(),
+        )
 
         # Classify outcome
         if price_change_pct >= 30:
-            record["outcome"] = "TP_HIT"
+            record.outcome = "TP_HIT"
         elif price_change_pct <= -50:
-            record["outcome"] = "RUG"
+            record.outcome = "RUG"
         elif price_change_pct <= -20:
-            record["outcome"] = "DUMP"
+            record.outcome = "DUMP"
         elif abs(price_change_pct) <= 10:
-            record["outcome"] = "FLAT"
+            record.outcome = "FLAT"
         elif price_change_pct > 10:
-            record["outcome"] = "IMPULSE"
+            record.outcome = "IMPULSE"
         else:
-            record["outcome"] = "CHOP"
+            record.outcome = "CHOP"
 
         # Store in signal engine
         self.engine.record_post_mortem(record)
@@ -6,12 +6,19 @@ On trigger, enqueues the contract address for Telegram delivery.
 import asyncio
 import logging
 import time
+from bisect import bisect_right
+from collections import defaultdict, deque
 
 import config
+from post_mortem import PostMortemRecord
 from signal_journal import SignalJournal
 
 logger = logging.getLogger("signal")
 
+# Time-to-signal histogram: upper bounds (exclusive) and their bucket labels
+_BUCKET_BOUNDS = (15, 30, 60, 90, 120)
+_BUCKET_KEYS = ("0-15s", "15-30s", "30-60s", "60-90s", "90-120s", "120s+")
+
 
 class SignalEngine:
     """
@@ -19,7 +26,7 @@ class SignalEngine:
     Called on every Swap event update AND every DexScreener poll.
     """
 
-    def __init__(self, state_tracker=None, sol_state_tracker=None):
+    def __init__(self, state_tracker=None, sol_state_tracker=None, journal: SignalJournal | None = None):
         # Signal output queue — Telegram sender consumes from here
         self.signal_queue: asyncio.Queue[str] = asyncio.Queue()
         # State tracker references (for deployer spam check)
@@ -28,27 +35,45 @@ class SignalEngine:
         # Persistent record of every signaled token + mcap at signal time
         # (survives eviction — used by volume scanner for "previously signaled" context)
         self.signaled_history: dict[str, float] = {}  # token_addr -> mcap_at_signal
-        # Same-symbol cooldown: symbol -> last signal timestamp
+        # Same-symbol cooldown: symbol -> last signal time (monotonic)
         # Prevents signaling 2+ tokens with identical names (e.g. 3 "PEPE" tokens)
         self._symbol_cooldowns: dict[str, float] = {}
-        # Anti-spam: track signals per hour
-        self._signal_timestamps: list[float] = []
+        # Anti-spam: track signals per hour (monotonic timestamps)
+        self._signal_timestamps: deque[float] = deque()
         # Stats
         self.total_evaluated: int = 0
         self.total_signaled: int = 0
         self.total_rejected: int = 0
-        self._reject_reasons: dict[str, int] = {}
-        # Time-to-signal tracking (seconds from pool creation → signal)
-        self._signal_latencies: list[float] = []
+        self._reject_reasons: defaultdict[str, int] = defaultdict(int)
+        # Time-to-signal tracking (seconds from pool creation → signal) —
+        # running aggregates instead of an ever-growing list
+        self._lat_sum: float = 0.0
+        self._lat_count: int = 0
+        self._lat_min: float = float("inf")
+        self._lat_max: float = 0.0
         # Latency distribution buckets
-        self._latency_buckets: dict[str, int] = {
-            "0-15s": 0, "15-30s": 0, "30-60s": 0,
-            "60-90s": 0, "90-120s": 0, "120s+": 0,
-        }
-        # Post-mortem records (filled async after 10 min)
-        self.post_mortems: list[dict] = []
+        self._latency_buckets: dict[str, int] = dict.fromkeys(_BUCKET_KEYS, 0)
+        # Post-mortem records (filled async after 10 min) — ring buffer of the
+        # most recent POST_MORTEM_HISTORY, with running outcome counters
+        self.post_mortems: deque[PostMortemRecord] = deque(maxlen=config.POST_MORTEM_HISTORY)
+        self._pm_tp_count: int = 0
+        self._pm_rug_count: int = 0
+        # Rule thresholds — snapshotted once so evaluate() reads instance
+        # attributes instead of config module globals on every call
+        self._min_liq = config.MIN_LIQUIDITY_USD
+        self._min_buys = config.MIN_BUYS
+        self._sol_max_age = config.SOL_MAX_TOKEN_AGE_SECONDS
+        self._evm_max_age = config.MAX_TOKEN_AGE_SECONDS
+        self._max_mcap = config.MAX_MCAP_USD
+        self._min_mcap = config.MIN_MCAP_USD
+        self._min_buy_pct = config.MIN_LARGEST_BUY_PCT
+        self._symbol_cooldown_s = config.SAME_SYMBOL_COOLDOWN_S
+        self._min_unique = config.MIN_UNIQUE_BUYERS
+        self._max_sph = config.MAX_SIGNALS_PER_HOUR
+        self._max_dep = config.MAX_DEPLOYER_TOKENS_24H
+        self._max_lat = config.MAX_SIGNAL_LATENCY_SECONDS
         # Persistent signal journal (append-only JSONL file)
-        self.journal = SignalJournal()
+        self.journal = journal or SignalJournal()
 
     async def evaluate(self, state) -> bool:
         """
@@ -64,14 +89,31 @@ class SignalEngine:
 
         token = state.token_address
 
+        # Count every launch toward its deployer's 24h history, whatever the
+        # outcome below — serial deployers' failing tokens must count too.
+        # Only the deployer_spam *check* runs last.
+        deployer_count = 0
+        if state.deployer_address:
+            tracker = (
+                self.sol_tracker
+                if state.is_solana and self.sol_tracker
+                else self.tracker
+            )
+            if tracker:
+                deployer_count = tracker.record_deployer(state.deployer_address, token)
+
         # ── HARD CONDITIONS (ALL REQUIRED) ──
+        # The journaled rules (age, mcap) run before the silent liquidity / buy
+        # pre-conditions so every stale or out-of-range token is recorded.
 
-        # 1. Token age — Solana uses tighter window (120s) vs EVM (180s)
-        age = state.age_seconds
+        # 1. Token age — Solana uses tighter window (120s) vs EVM (180s).
+        # One wall-clock sample serves age, latency and the journal record.
+        now = time.time()
+        age = now - state.first_seen
         max_age = (
-            config.SOL_MAX_TOKEN_AGE_SECONDS
-            if state.dex_version.startswith("solana")
-            else config.MAX_TOKEN_AGE_SECONDS
+            self._sol_max_age
+            if state.is_solana
+            else self._evm_max_age
         )
         if age > max_age:
             self._reject(token, "too_old", f"age={age:.0f}s", state)
@@ -79,57 +121,39 @@ class SignalEngine:
 
         # 2. Market cap ≤ MAX and ≥ MIN
         mcap = state.best_mcap
-        if mcap > config.MAX_MCAP_USD and mcap > 0:
+        if mcap > self._max_mcap:
             self._reject(token, "mcap_high", f"mcap=${mcap:.0f}", state)
             return False
-        if config.MIN_MCAP_USD > 0 and mcap > 0 and mcap < config.MIN_MCAP_USD:
+        if self._min_mcap > 0 and mcap > 0 and mcap < self._min_mcap:
             self._reject(token, "mcap_low", f"mcap=${mcap:.0f}", state)
             return False
 
-        # 3. Liquidity ≥ 3,000 USD
+        # 3. Liquidity ≥ 3,000 USD (and non-zero even if MIN_LIQUIDITY_USD=0,
+        #    so the largest-buy percentage below can divide without a guard)
         liquidity = state.best_liquidity
-        if liquidity < config.MIN_LIQUIDITY_USD:
+        if liquidity < self._min_liq or liquidity <= 0:
             # Don't log this as rejection — it's the most common pre-condition
             return False
 
         # 4. Total buys ≥ 2
         buys = state.best_buys
-        if buys < config.MIN_BUYS:
+        if buys < self._min_buys:
             return False
 
         # 5. Largest single buy ≥ 10% of liquidity
-        if liquidity > 0:
-            largest_buy_pct = (state.largest_buy_usd / liquidity) * 100
-        else:
-            largest_buy_pct = 0
-
-        if largest_buy_pct < config.MIN_LARGEST_BUY_PCT:
+        largest_buy = state.largest_buy_usd
+        largest_buy_pct = (largest_buy / liquidity) * 100
+        if largest_buy_pct < self._min_buy_pct:
             self._reject(token, "weak_buy", f"largest={largest_buy_pct:.1f}%", state)
             return False
 
         # ── ANTI-SPAM GUARDS ──
+        # Flag checks first; the rate limiter and the deployer count check run
+        # last, only for otherwise-qualifying tokens.
 
-        # Max signals per hour
-        now = time.time()
-        self._signal_timestamps = [
-            t for t in self._signal_timestamps if now - t < 3600
-        ]
-        if len(self._signal_timestamps) >= config.MAX_SIGNALS_PER_HOUR:
-            self._reject(token, "rate_limited", "max signals/hour reached", state)
-            return False
-
-        # Deployer spam check — reject if deployer launched too many tokens in 24h
-        # Use the correct tracker per chain
-        if state.deployer_address:
-            tracker = (
-                self.sol_tracker
-                if state.dex_version.startswith("solana") and self.sol_tracker
-                else self.tracker
-            )
-            deployer_count = tracker.record_deployer(state.deployer_address, state.token_address) if tracker else 0
-            if deployer_count > config.MAX_DEPLOYER_TOKENS_24H:
-                self._reject(token, "deployer_spam", f"deployer launched {deployer_count} tokens in 24h", state)
-                return False
+        # Rate-limit and cooldown windows run on the monotonic clock (immune to
+        # NTP jumps); wall-clock `now` is kept for state / latency fields.
+        mono = time.monotonic()
 
         # Bytecode safety (non-blocking — only blocks if result available)
         if state.bytecode_safe is False:
@@ -146,13 +170,14 @@ class SignalEngine:
         if state.token_symbol:
             sym_key = state.token_symbol.upper()
             last_signal_time = self._symbol_cooldowns.get(sym_key)
-            if last_signal_time and now - last_signal_time < config.SAME_SYMBOL_COOLDOWN_S:
-                self._reject(token, "dup_symbol", f"${state.token_symbol} already signaled {now - last_signal_time:.0f}s ago", state)
+            if last_signal_time and mono - last_signal_time < self._symbol_cooldown_s:
+                self._reject(token, "dup_symbol", f"${state.token_symbol} already signaled {mono - last_signal_time:.0f}s ago", state)
                 return False
 
         # Minimum unique buyers — require different wallets, not just total buys
-        if len(state.unique_buyers) < config.MIN_UNIQUE_BUYERS:
-            self._reject(token, "few_unique_buyers", f"unique={len(state.unique_buyers)}", state)
+        unique = len(state.unique_buyers)
+        if unique < self._min_unique:
+            self._reject(token, "few_unique_buyers", f"unique={unique}", state)
             return False
 
         # No socials warning — don't reject, but track (useful for analysis)
@@ -165,98 +190,130 @@ class SignalEngine:
                 self._reject(token, "no_sells", "possible honeypot (0 sells)", state)
                 return False
 
+        # Max signals per hour — only prune expired timestamps when the count
+        # is at the limit; well below it a single length compare is enough.
+        if len(self._signal_timestamps) >= self._max_sph:
+            self._prune_signal_timestamps(mono)
+            if len(self._signal_timestamps) >= self._max_sph:
+                self._reject(token, "rate_limited", "max signals/hour reached", state)
+                return False
+
+        # Deployer spam check — reject if deployer launched too many tokens in 24h
+        # (count recorded at the top of evaluate())
+        if deployer_count > self._max_dep:
+            self._reject(token, "deployer_spam", f"deployer launched {deployer_count} tokens in 24h", state)
+            return False
+
         # ── SIGNAL TRIGGERED — mark permanently, one signal per token ──
 
         # Latency cutoff: if signal took too long, edge is gone
         time_to_signal = now - state.first_seen
-        if config.MAX_SIGNAL_LATENCY_SECONDS > 0:
-            if time_to_signal > config.MAX_SIGNAL_LATENCY_SECONDS:
+        if self._max_lat > 0:
+            if time_to_signal > self._max_lat:
                 self._reject(token, "too_slow", f"latency={time_to_signal:.0f}s", state)
                 return False
 
         state.signaled = True
         state.signal_time = now
-        self._signal_timestamps.append(now)
+        self._signal_timestamps.append(mono)
         self.total_signaled += 1
         self.signaled_history[state.token_address] = mcap
 
         # Record symbol cooldown
         if state.token_symbol:
-            self._symbol_cooldowns[state.token_symbol.upper()] = now
+            self._symbol_cooldowns[state.token_symbol.upper()] = mono
             # Prune old cooldowns
-            cutoff = now - config.SAME_SYMBOL_COOLDOWN_S
+            cutoff = mono - self._symbol_cooldown_s
             self._symbol_cooldowns = {
                 s: t for s, t in self._symbol_cooldowns.items() if t > cutoff
             }
 
         # Track time-to-signal (pool creation → signal fire)
-        self._signal_latencies.append(time_to_signal)
+        self._lat_sum += time_to_signal
+        self._lat_count += 1
+        if time_to_signal < self._lat_min:
+            self._lat_min = time_to_signal
+        if time_to_signal > self._lat_max:
+            self._lat_max = time_to_signal
         self._bucket_latency(time_to_signal)
 
-        momentum = state.has_momentum()
-
-        hooks_tag = ""
-        if state.hooks_address and not state.hooks_address.endswith('0' * 40):
-            hooks_tag = f"  hooks={state.hooks_address[:10]}"
-
-        name_tag = ""
-        if state.token_symbol:
-            name_tag = f"  ${state.token_symbol}"
-            if not state.has_socials:
-                name_tag += " ⚠no-socials"
-
-        logger.info(
-            f"\n{'═' * 55}\n"
-            f"  🎯 SIGNAL  {state.dex_version}  {state.token_address}{name_tag}\n"
-            f"  mcap=${mcap:,.0f}  liq=${liquidity:,.0f}  buys={buys}({len(state.unique_buyers)}u)  "
-            f"vol=${state.buy_volume_usd:,.0f}  top=${state.largest_buy_usd:,.0f}({largest_buy_pct:.0f}%)\n"
-            f"  mom={'YES' if momentum else 'no'}  age={age:.0f}s  "
-            f"latency={time_to_signal:.0f}s{hooks_tag}\n"
-            f"{'═' * 55}"
-        )
+        # Only build the banner (and touch the state fields it reads) when
+        # INFO is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            momentum = state.has_momentum()
+
+            hooks_tag = ""
+            if state.hooks_address and not state.hooks_address.endswith('0' * 40):
+                hooks_tag = f"  hooks={state.hooks_address[:10]}"
+
+            name_tag = ""
+            if state.token_symbol:
+                name_tag = f"  ${state.token_symbol}"
+                if not state.has_socials:
+                    name_tag += " ⚠no-socials"
+
+            logger.info(
+                f"\n{'═' * 55}\n"
+                f"  🎯 SIGNAL  {state.dex_version}  {state.token_address}{name_tag}\n"
+                f"  mcap=${mcap:,.0f}  liq=${liquidity:,.0f}  buys={buys}({unique}u)  "
+                f"vol=${state.buy_volume_usd:,.0f}  top=${largest_buy:,.0f}({largest_buy_pct:.0f}%)\n"
+                f"  mom={'YES' if momentum else 'no'}  age={age:.0f}s  "
+                f"latency={time_to_signal:.0f}s{hooks_tag}\n"
+                f"{'═' * 55}"
+            )
 
         # Log to persistent journal
-        self.journal.log_signal(state)
+        self.journal.log_signal(state, now=now)
 
         # Enqueue for Telegram
         await self.signal_queue.put(state.token_address)
         return True
 
+    def _prune_signal_timestamps(self, mono: float):
+        """Drop signal timestamps (monotonic) older than one hour.
+
+        Timestamps are appended in order, so expired ones are always at the
+        head — pop until the oldest is fresh.
+        """
+        timestamps = self._signal_timestamps
+        while timestamps and mono - timestamps[0] >= 3600:
+            timestamps.popleft()
+
     def _reject(self, token: str, reason: str, detail: str = "", state=None):
         """Track rejection reason for debugging."""
-        self._reject_reasons[reason] = self._reject_reasons.get(reason, 0) + 1
+        self._reject_reasons[reason] += 1
         self.total_rejected += 1
         self.journal.log_reject(token, reason, detail, state)
-        if detail:
+        if detail and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"[skip] {token[:10]}... {reason}: {detail}")
 
     def _bucket_latency(self, latency: float):
         """Bucket a latency value for distribution analysis."""
-        if latency < 15:
-            self._latency_buckets["0-15s"] += 1
-        elif latency < 30:
-            self._latency_buckets["15-30s"] += 1
-        elif latency < 60:
-            self._latency_buckets["30-60s"] += 1
-        elif latency < 90:
-            self._latency_buckets["60-90s"] += 1
-        elif latency < 120:
-            self._latency_buckets["90-120s"] += 1
-        else:
-            self._latency_buckets["120s+"] += 1
-
-    def record_post_mortem(self, record: dict):
+        self._latency_buckets[_BUCKET_KEYS[bisect_right(_BUCKET_BOUNDS, latency)]] += 1
+
+    def record_post_mortem(self, record: PostMortemRecord):
         """Store a post-mortem record for a signaled token."""
+        if len(self.post_mortems) == self.post_mortems.maxlen:
+            # Oldest record is about to be evicted — drop it from the counters
+            self._count_post_mortem(self.post_mortems[0], -1)
         self.post_mortems.append(record)
-        outcome = record.get("outcome", "?")
-        change = record.get("price_change_pct", 0)
+        self._count_post_mortem(record, 1)
         logger.info(
-            f"[pm] {outcome} {record['token'][:12]}.. "
-            f"${record.get('mcap_at_signal', 0):,.0f}→${record.get('mcap_10m', 0):,.0f} "
-            f"({change:+.0f}%)"
+            f"[pm] {record.outcome or '?'} {record.token[:12]}.. "
+            f"${record.mcap_at_signal:,.0f}→${record.mcap_10m:,.0f} "
+            f"({record.price_change_pct:+.0f}%)"
         )
 
+    def _count_post_mortem(self, record: PostMortemRecord, delta: int):
+        """Adjust the running TP / rug counters for one record."""
+        if record.price_change_pct >= 30:
+            self._pm_tp_count += delta
+        elif record.price_change_pct <= -50:
+            self._pm_rug_count += delta
+
     def get_stats(self) -> dict:
+        # Pruning is lazy in evaluate(), so bring the hourly count up to date here
+        self._prune_signal_timestamps(time.monotonic())
         stats = {
             "evaluated": self.total_evaluated,
             "signaled": self.total_signaled,
@@ -265,10 +322,10 @@ class SignalEngine:
             "signals_this_hour": len(self._signal_timestamps),
         }
         # Time-to-signal metrics
-        if self._signal_latencies:
-            stats["avg_latency_s"] = round(sum(self._signal_latencies) / len(self._signal_latencies), 1)
-            stats["min_latency_s"] = round(min(self._signal_latencies), 1)
-            stats["max_latency_s"] = round(max(self._signal_latencies), 1)
+        if self._lat_count:
+            stats["avg_latency_s"] = round(self._lat_sum / self._lat_count, 1)
+            stats["min_latency_s"] = round(self._lat_min, 1)
+            stats["max_latency_s"] = round(self._lat_max, 1)
         # Latency distribution buckets
         total_signals = sum(self._latency_buckets.values())
         if total_signals > 0:
@@ -278,10 +335,11 @@ class SignalEngine:
                 if count > 0
             }
         # Post-mortem summary
-        if self.post_mortems:
-            tp_count = sum(1 for pm in self.post_mortems if pm.get('price_change_pct', 0) >= 30)
-            rug_count = sum(1 for pm in self.post_mortems if pm.get('price_change_pct', 0) <= -50)
-            stats["post_mortem_count"] = len(self.post_mortems)
-            stats["tp_hit_rate"] = f"{tp_count}/{len(self.post_mortems)} ({tp_count/len(self.post_mortems)*100:.0f}%)"
-            stats["rug_rate"] = f"{rug_count}/{len(self.post_mortems)} ({rug_count/len(self.post_mortems)*100:.0f}%)"
+        pm_count = len(self.post_mortems)
+        if pm_count:
+            tp_count = self._pm_tp_count
+            rug_count = self._pm_rug_count
+            stats["post_mortem_count"] = pm_count
+            stats["tp_hit_rate"] = f"{tp_count}/{pm_count} ({tp_count/pm_count*100:.0f}%)"
+            stats["rug_rate"] = f"{rug_count}/{pm_count} ({rug_count/pm_count*100:.0f}%)"
         return stats
@@ -2,7 +2,13 @@
 Signal Journal — persistent append-only log of every signal decision.
 
 Writes one JSON line per event to `signal_journal.jsonl`.
-Survives restarts, easy to grep/analyze, no dependencies.
+Survives restarts, easy to grep/analyze. Serialized with orjson.
+
+SIGNAL_JOURNAL_FORMAT=framed switches to length-prefixed binary frames
+(u32 little-endian length + orjson payload) — not greppable, but bulk
+readers skip newline scanning. Each format has its own file extension
+(.jsonl / .frames) so the two are never appended to one file.
+read_journal() handles both formats.
 
 Events logged:
   - SIGNAL: token passed all rules → sent to Telegram
@@ -12,45 +18,91 @@ Usage:
     journal = SignalJournal()
     journal.log_signal(state, metrics)
     journal.log_reject(token, reason, detail, state)
+
+    for record in read_journal("signal_journal.jsonl"):
+        ...
 """
-import json
+import asyncio
 import logging
 import os
+import struct
 import time
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger("journal")
 
-JOURNAL_FILE = Path(os.getenv("SIGNAL_JOURNAL_PATH", "signal_journal.jsonl"))
+# "jsonl" (default) or "framed"
+JOURNAL_FORMAT = os.getenv("SIGNAL_JOURNAL_FORMAT", "jsonl").lower()
+JOURNAL_SUFFIX = {"jsonl": ".jsonl", "framed": ".frames"}
+JOURNAL_FILE = Path(os.getenv(
+    "SIGNAL_JOURNAL_PATH", "signal_journal" + JOURNAL_SUFFIX.get(JOURNAL_FORMAT, ".jsonl")
+))
+
+_FRAME_LEN = struct.Struct("<I")
 
 # Only log 1 in N rejections to keep file size reasonable.
 # Signals are always logged (they're rare and valuable).
 REJECT_SAMPLE_RATE = 20
+# Rejections that are rare/interesting enough to bypass sampling
+ALWAYS_LOG_REASONS = frozenset({
+    "rate_limited", "deployer_spam", "copycat", "dup_symbol", "no_sells", "unsafe_bytecode",
+})
+
+# Buffered writes: flush every N records, and at least every T seconds
+# from run_flush_loop(). SIGNAL records are always flushed immediately.
+FLUSH_EVERY = 32
+FLUSH_INTERVAL_S = 2.0
+BUFFER_SIZE = 1 << 16
 
 
 class SignalJournal:
     """Append-only JSONL logger for signal decisions."""
 
-    def __init__(self, path: Path | None = None):
+    def __init__(self, path: Path | None = None, fmt: str | None = None):
         self._path = path or JOURNAL_FILE
+        fmt = fmt or JOURNAL_FORMAT
+        if fmt not in JOURNAL_SUFFIX:
+            raise ValueError(f"Unknown journal format {fmt!r} (expected jsonl or framed)")
+        # The suffix pins a file to one format — appending frames to a JSONL
+        # file (or vice versa) would leave it unreadable
+        if self._path.suffix != JOURNAL_SUFFIX[fmt]:
+            raise ValueError(
+                f"{fmt} journal needs a '{JOURNAL_SUFFIX[fmt]}' file, got {self._path}"
+            )
+        self._framed = fmt == "framed"
         self._reject_counter = 0
+        self._pending = 0
+        # Opened on the first write, then kept for the process lifetime
+        # instead of open/write/close per line. The owner calls close().
+        self._fh = None
+
+    def _open(self):
         # Ensure parent dir exists
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Signal journal: {self._path}")
+        self._fh = open(self._path, "ab", buffering=BUFFER_SIZE)
+        logger.info(f"Signal journal: {self._path}{' (framed)' if self._framed else ''}")
+
+    def log_signal(self, state, extra: dict | None = None, now: float | None = None):
+        """Log a fired signal with full metrics snapshot.
 
-    def log_signal(self, state, extra: dict | None = None):
-        """Log a fired signal with full metrics snapshot."""
+        `now` lets the caller pass the wall-clock time it already sampled.
+        """
+        if now is None:
+            now = time.time()
+        age = now - state.first_seen
         record = {
-            "ts": time.time(),
+            "ts": now,
             "event": "SIGNAL",
             "token": state.token_address,
             "symbol": state.token_symbol or "",
             "name": state.token_name or "",
-            "chain": "solana" if state.dex_version.startswith("solana") else "base",
+            "chain": "solana" if state.is_solana else "base",
             "dex": state.dex_version,
             "pair": state.pair_address,
-            "age_s": round(state.age_seconds, 1),
-            "latency_s": round(time.time() - state.first_seen, 1),
+            "age_s": round(age, 1),
+            "latency_s": round(age, 1),
             "mcap": round(state.best_mcap, 0),
             "mcap_onchain": round(state.estimated_mcap, 0),
             "mcap_ds": round(state.ds_mcap, 0) if state.ds_mcap else None,
@@ -74,14 +126,14 @@ class SignalJournal:
         if extra:
             record.update(extra)
         self._write(record)
+        self.flush()
 
     def log_reject(self, token: str, reason: str, detail: str = "", state=None):
         """Log a rejection (sampled). Always logs rate_limited and unusual reasons."""
         self._reject_counter += 1
 
         # Always log interesting rejections; sample the noisy common ones
-        always_log = {"rate_limited", "deployer_spam", "copycat", "dup_symbol", "no_sells", "unsafe_bytecode"}
-        if reason not in always_log and self._reject_counter % REJECT_SAMPLE_RATE != 0:
+        if reason not in ALWAYS_LOG_REASONS and self._reject_counter % REJECT_SAMPLE_RATE != 0:
             return
 
         record = {
@@ -91,21 +143,78 @@ class SignalJournal:
             "reason": reason,
             "detail": detail,
         }
-        if state:
-            record.update({
-                "symbol": getattr(state, "token_symbol", ""),
-                "chain": "solana" if getattr(state, "dex_version", "").startswith("solana") else "base",
-                "age_s": round(state.age_seconds, 1) if hasattr(state, "age_seconds") else None,
-                "mcap": round(state.best_mcap, 0) if hasattr(state, "best_mcap") else None,
-                "liq": round(state.best_liquidity, 0) if hasattr(state, "best_liquidity") else None,
-                "buys": state.best_buys if hasattr(state, "best_buys") else None,
-            })
+        if state is not None:
+            # state is always a TokenState / SolTokenState — read fields directly
+            record["symbol"] = state.token_symbol or ""
+            record["chain"] = "solana" if state.is_solana else "base"
+            record["age_s"] = round(state.age_seconds, 1)
+            record["mcap"] = round(state.best_mcap, 0)
+            record["liq"] = round(state.best_liquidity, 0)
+            record["buys"] = state.best_buys
         self._write(record)
 
     def _write(self, record: dict):
-        """Append one JSON line to the journal file."""
+        """Append one record (JSON line or length-prefixed frame) to the buffer."""
         try:
-            with open(self._path, "a") as f:
-                f.write(json.dumps(record, default=str) + "\n")
+            if self._fh is None:
+                self._open()
+            buf = orjson.dumps(record, default=str)
+            if self._framed:
+                self._fh.write(_FRAME_LEN.pack(len(buf)))
+                self._fh.write(buf)
+            else:
+                self._fh.write(buf + b"\n")
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self.flush()
         except Exception as e:
             logger.debug(f"Journal write failed: {e}")
+
+    def flush(self):
+        """Push buffered lines to the OS."""
+        if self._pending == 0 or self._fh is None or self._fh.closed:
+            return
+        try:
+            self._fh.flush()
+        except Exception as e:
+            logger.debug(f"Journal flush failed: {e}")
+        self._pending = 0
+
+    async def run_flush_loop(self):
+        """Flush periodically so sampled rejects never sit in the buffer for long."""
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_S)
+            self.flush()
+
+    def close(self):
+        """Flush and close the journal file (idempotent)."""
+        if self._fh is None or self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+
+
+def read_journal(path: str | Path, fmt: str | None = None):
+    """Yield journal records from a JSONL or framed journal file.
+
+    The format defaults to the one implied by the file's suffix.
+    """
+    if fmt is None:
+        fmt = "framed" if Path(path).suffix == JOURNAL_SUFFIX["framed"] else "jsonl"
+    framed = fmt == "framed"
+    with open(path, "rb") as f:
+        if not framed:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+            return
+        header_size = _FRAME_LEN.size
+        while True:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return  # EOF (or a torn trailing header)
+            (length,) = _FRAME_LEN.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # torn trailing frame
+            yield orjson.loads(payload)
@@ -47,6 +47,10 @@ METEORA_DLMM = "LBUZKhRxPF3XUpBCjp4YzTKgLccjZhTSDM9YuVaPwxo"
 #  We decode base64 → check byte[0] to identify the event.
 # ═══════════════════════════════════════════════════════════════
 
+# Full log line prefix emitted by the AMM program: "Program log: ray_log: <b64>"
+RAY_LOG_PREFIX = "Program log: ray_log: "
+RAY_LOG_PREFIX_LEN = len(RAY_LOG_PREFIX)
+
 RAY_LOG_INIT = 0            # Pool initialization (new pool)
 RAY_LOG_DEPOSIT = 1         # Add liquidity
 RAY_LOG_WITHDRAW = 2        # Remove liquidity
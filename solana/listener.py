@@ -16,24 +16,51 @@ Auto-reconnects with exponential backoff on disconnect.
 """
 import asyncio
 import base64
-import json
 import logging
 import struct
 import time
+from collections import deque
+from itertools import chain
 
 import aiohttp
+import orjson
 
 from solana.constants import (
     RAYDIUM_AMM_V4,
+    RAYDIUM_IX_AMM,
     WSOL,
     RAY_LOG_INIT,
+    RAY_LOG_PREFIX,
+    RAY_LOG_PREFIX_LEN,
     RAY_LOG_INIT_PC_AMOUNT_OFFSET,
-    RAY_LOG_INIT_COIN_AMOUNT_OFFSET,
     RAY_LOG_INIT_MIN_LENGTH,
 )
 
 logger = logging.getLogger("sol_listener")
 
+# pc_amount and coin_amount are adjacent u64s in the init ray_log
+# (RAY_LOG_INIT_COIN_AMOUNT_OFFSET == RAY_LOG_INIT_PC_AMOUNT_OFFSET + 8),
+# so one precompiled struct reads both straight from the buffer
+_RAY_INIT_AMOUNTS = struct.Struct("<QQ")
+
+# How many recent init signatures to remember for dedupe across reconnects
+SEEN_SIGNATURES_MAX = 4096
+
+# getTransaction pacing: up to N requests in flight, at most M started per second
+RPC_MAX_IN_FLIGHT = 4
+RPC_MAX_PER_SECOND = 10
+
+# logsSubscribe request is constant — serialize it once at import
+_LOGS_SUBSCRIBE = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "logsSubscribe",
+    "params": [
+        {"mentions": [RAYDIUM_AMM_V4]},
+        {"commitment": "confirmed"},
+    ],
+}).decode()
+
 
 class SolanaListener:
     """
@@ -61,8 +88,13 @@ class SolanaListener:
         self.min_liquidity_sol = min_liquidity_sol
         self._session: aiohttp.ClientSession | None = None
         self._running = False
-        self._rpc_lock = asyncio.Lock()
-        self._last_rpc: float = 0.0
+        self._rpc_sem = asyncio.Semaphore(RPC_MAX_IN_FLIGHT)
+        self._rpc_starts: deque[float] = deque()  # monotonic, last 1s
+        # Init tx signatures already handed to _handle_pool_init — a
+        # re-delivered notification (e.g. after a reconnect) must not cost
+        # another getTransaction. Set for lookup, deque for FIFO eviction.
+        self._seen_signatures: set[str] = set()
+        self._seen_order: deque[str] = deque()
         # Stats
         self.pools_detected: int = 0
         self.pools_skipped: int = 0
@@ -104,19 +136,12 @@ class SolanaListener:
             heartbeat=30,
             max_msg_size=0,  # no limit
         ) as ws:
-            # Subscribe to Raydium AMM V4 program logs
-            await ws.send_json({
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "logsSubscribe",
-                "params": [
-                    {"mentions": [RAYDIUM_AMM_V4]},
-                    {"commitment": "confirmed"},
-                ],
-            })
+            # Subscribe to Raydium AMM V4 program logs (sent as a text frame —
+            # JSON-RPC endpoints expect text, not binary)
+            await ws.send_str(_LOGS_SUBSCRIBE)
 
             # Read subscription confirmation
-            resp = await ws.receive_json(timeout=10)
+            resp = await ws.receive_json(loads=orjson.loads, timeout=10)
             sub_id = resp.get("result")
             if sub_id is None:
                 error = resp.get("error", {})
@@ -131,7 +156,7 @@ class SolanaListener:
                     break
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        data = json.loads(msg.data)
+                        data = orjson.loads(msg.data)
                         await self._handle_notification(data)
                     except Exception as e:
                         logger.debug(f"Message parse error: {e}")
@@ -158,26 +183,33 @@ class SolanaListener:
         if err is not None:
             return
 
-        # Search for ray_log entries in the log lines
+        # Search for ray_log entries in the log lines — most lines are
+        # "Program invoke/consumed" noise, so a constant prefix test rejects
+        # them without scanning the whole line
         for line in logs:
-            if "ray_log:" not in line:
+            if not line.startswith(RAY_LOG_PREFIX):
                 continue
 
             try:
-                parts = line.split("ray_log: ", 1)
-                if len(parts) < 2:
-                    continue
-                b64_str = parts[1].strip()
-                raw = base64.b64decode(b64_str)
-                if len(raw) < 1:
+                raw = base64.b64decode(line[RAY_LOG_PREFIX_LEN:].strip())
+                if not raw:
                     continue
 
-                log_type = raw[0]
-
-                if log_type == RAY_LOG_INIT:
-                    # New pool initialization — process it
+                if raw[0] == RAY_LOG_INIT:
+                    # New pool initialization — gate on initial liquidity
+                    # here so dust pools never cost a task + RPC round-trip
+                    init_sol = self._parse_init_sol(raw)
+                    if init_sol < self.min_liquidity_sol:
+                        self.pools_skipped += 1
+                        logger.debug(
+                            f"[sol-skip] {signature[:16]}... liq={init_sol:.2f} SOL "
+                            f"< min {self.min_liquidity_sol}"
+                        )
+                        return
+                    if not self._mark_seen(signature):
+                        return
                     asyncio.create_task(
-                        self._handle_pool_init(signature, raw)
+                        self._handle_pool_init(signature, init_sol)
                     )
                     return  # one init per tx
 
@@ -185,41 +217,28 @@ class SolanaListener:
                 logger.debug(f"ray_log parse error: {e}")
                 continue
 
-    async def _handle_pool_init(self, signature: str, ray_log_data: bytes):
-        """Handle a Raydium AMM V4 pool initialization."""
-
-        # ── Parse initial liquidity from ray_log ──────────────
-        init_sol_lamports = 0
-        init_coin_amount = 0
-        try:
-            if len(ray_log_data) >= RAY_LOG_INIT_MIN_LENGTH:
-                init_sol_lamports = struct.unpack(
-                    "<Q",
-                    ray_log_data[
-                        RAY_LOG_INIT_PC_AMOUNT_OFFSET
-                        : RAY_LOG_INIT_PC_AMOUNT_OFFSET + 8
-                    ],
-                )[0]
-                init_coin_amount = struct.unpack(
-                    "<Q",
-                    ray_log_data[
-                        RAY_LOG_INIT_COIN_AMOUNT_OFFSET
-                        : RAY_LOG_INIT_COIN_AMOUNT_OFFSET + 8
-                    ],
-                )[0]
-        except Exception:
-            pass
-
-        init_sol = init_sol_lamports / 1e9  # lamports → SOL
+    def _mark_seen(self, signature: str) -> bool:
+        """Remember an init signature. Returns False if it was already seen."""
+        if signature in self._seen_signatures:
+            return False
+        self._seen_signatures.add(signature)
+        self._seen_order.append(signature)
+        if len(self._seen_order) > SEEN_SIGNATURES_MAX:
+            self._seen_signatures.discard(self._seen_order.popleft())
+        return True
+
+    @staticmethod
+    def _parse_init_sol(ray_log_data: bytes) -> float:
+        """Initial SOL liquidity (pc_amount) from an init ray_log, 0 if malformed."""
+        if len(ray_log_data) < RAY_LOG_INIT_MIN_LENGTH:
+            return 0.0
+        init_sol_lamports, _init_coin_amount = _RAY_INIT_AMOUNTS.unpack_from(
+            ray_log_data, RAY_LOG_INIT_PC_AMOUNT_OFFSET
+        )
+        return init_sol_lamports / 1e9  # lamports → SOL
 
-        # Quick filter: skip tiny pools
-        if init_sol < self.min_liquidity_sol:
-            self.pools_skipped += 1
-            logger.debug(
-                f"[sol-skip] {signature[:16]}... liq={init_sol:.2f} SOL "
-                f"< min {self.min_liquidity_sol}"
-            )
-            return
+    async def _handle_pool_init(self, signature: str, init_sol: float):
+        """Handle a Raydium AMM V4 pool initialization (already liquidity-gated)."""
 
         # ── Fetch full transaction for account details ────────
         tx = await self._rpc_get_transaction(signature)
@@ -233,23 +252,22 @@ class SolanaListener:
             return
         post_balances = meta.get("postTokenBalances", [])
 
-        mints_in_tx = set()
+        # Must involve WSOL; the other mint is the new token. Only 2–4
+        # balances per init, so a single linear pass beats building a set.
+        token_mint = None
+        has_wsol = False
         for bal in post_balances:
-            mint = bal.get("mint", "")
-            if mint:
-                mints_in_tx.add(mint)
-
-        # Must involve WSOL
-        if WSOL not in mints_in_tx:
-            return
+            mint = bal.get("mint")
+            if not mint:
+                continue
+            if mint == WSOL:
+                has_wsol = True
+            elif token_mint is None:
+                token_mint = mint
 
-        # Find the non-WSOL mint (the new token)
-        token_mints = [m for m in mints_in_tx if m != WSOL]
-        if not token_mints:
+        if not has_wsol or token_mint is None:
             return
 
-        token_mint = token_mints[0]
-
         # Already tracked? Skip duplicate inits
         if self.tracker.get(token_mint) is not None:
             return
@@ -298,33 +316,38 @@ class SolanaListener:
                 .get("message", {})
                 .get("instructions", [])
             )
-            for ix in instructions:
-                program_id = ix.get("programId", "")
-                if program_id == RAYDIUM_AMM_V4:
+            inner = (tx.get("meta") or {}).get("innerInstructions") or []
+            # Top-level instructions first, then inner ones as fallback —
+            # one pass, stops at the first Raydium match
+            candidates = chain(
+                instructions,
+                (ix for group in inner for ix in group.get("instructions", [])),
+            )
+            for ix in candidates:
+                if ix.get("programId", "") == RAYDIUM_AMM_V4:
                     accounts = ix.get("accounts", [])
-                    if len(accounts) > 4:
-                        return accounts[4]  # AMM address at index 4
-
-            # Fallback: check inner instructions
-            inner = tx.get("meta", {}).get("innerInstructions", [])
-            for group in inner:
-                for ix in group.get("instructions", []):
-                    if ix.get("programId", "") == RAYDIUM_AMM_V4:
-                        accounts = ix.get("accounts", [])
-                        if len(accounts) > 4:
-                            return accounts[4]
+                    if len(accounts) > RAYDIUM_IX_AMM:
+                        return accounts[RAYDIUM_IX_AMM]
         except Exception:
             pass
         return ""
 
+    async def _rpc_throttle(self):
+        """Wait until starting another RPC keeps us within RPC_MAX_PER_SECOND."""
+        starts = self._rpc_starts
+        while True:
+            now = time.monotonic()
+            while starts and now - starts[0] >= 1.0:
+                starts.popleft()
+            if len(starts) < RPC_MAX_PER_SECOND:
+                starts.append(now)
+                return
+            await asyncio.sleep(1.0 - (now - starts[0]))
+
     async def _rpc_get_transaction(self, signature: str) -> dict | None:
         """Fetch a transaction with jsonParsed encoding. Rate-limited."""
-        async with self._rpc_lock:
-            # Rate limit: min 100ms between RPC calls
-            now = time.time()
-            wait = 0.1 - (now - self._last_rpc)
-            if wait > 0:
-                await asyncio.sleep(wait)
+        async with self._rpc_sem:
+            await self._rpc_throttle()
 
             try:
                 async with self._session.post(
@@ -343,7 +366,6 @@ class SolanaListener:
                         ],
                     },
                 ) as resp:
-                    self._last_rpc = time.time()
                     data = await resp.json()
                     return data.get("result")
             except Exception as e:
@@ -6,36 +6,115 @@ If mint authority exists → deployer can mint infinite tokens → dump.
 If freeze authority exists → deployer can freeze your account → you can't sell.
 Both must be None for the token to pass safety.
 
-Uses raw Solana JSON-RPC (getAccountInfo with jsonParsed encoding)
-via aiohttp. No solana-py dependency.
+Uses raw Solana JSON-RPC (getAccountInfo / getMultipleAccounts with
+jsonParsed encoding) via aiohttp. No solana-py dependency.
 """
 import asyncio
 import logging
+import time
 
 import aiohttp
+import orjson
+
+import config
+import http_pool
 
 logger = logging.getLogger("sol_safety")
 
+# getMultipleAccounts accepts at most 100 pubkeys per request
+MAX_MULTIPLE_ACCOUNTS = 100
+# "finalized" (the RPC default) lags ~30 slots, so a mint created seconds
+# before its pool would read as missing
+RPC_ACCOUNT_OPTS = {"encoding": "jsonParsed", "commitment": "confirmed"}
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter: `rate` tokens/s, up to `burst` saved.
+
+    acquire() reserves a token immediately (the balance may go negative)
+    and sleeps off the debt outside any lock, so waiters don't serialize
+    on each other's sleeps — they just queue up in reservation order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+
+    async def acquire(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
 
 class SolSafetyChecker:
     """Check SPL token mint/freeze authorities via Solana RPC."""
 
-    def __init__(self, rpc_http: str):
+    def __init__(self, rpc_http: str, session: aiohttp.ClientSession | None = None):
         self.rpc_http = rpc_http
-        self._session: aiohttp.ClientSession | None = None
-        self._lock = asyncio.Lock()
-        self._last_call: float = 0.0
-
-    async def _ensure_session(self):
+        # Injected session (shared pool) is owned by the caller; otherwise
+        # we create and close our own
+        self._session = session
+        self._owns_session = session is None
+        self._bucket = TokenBucket(config.SOL_RPC_RATE, config.SOL_RPC_BURST)
+        self._sem = asyncio.Semaphore(config.SOL_RPC_CONCURRENCY)
+
+    async def start(self):
+        """Create the HTTP session up front (no-op when one was injected).
+
+        Called once at bootstrap so the request path never has to check
+        for, or lazily rebuild, a session.
+        """
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
+            self._session = http_pool.new_session()
+            self._owns_session = True
 
     async def close(self):
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
+    async def _post(self, payload: dict) -> dict:
+        """POST one JSON-RPC request, paced by the token bucket."""
+        if self._session is None:
+            raise RuntimeError("SolSafetyChecker.start() not called")
+        await self._bucket.acquire()
+        async with self._sem:
+            async with self._session.post(self.rpc_http, json=payload) as resp:
+                return orjson.loads(await resp.read())
+
+    def _parse_mint_account(self, value: dict | None) -> dict:
+        """Turn a jsonParsed mint account (or None) into a safety result."""
+        if value is None:
+            # Not visible to the RPC node yet — unknown, retried next pass
+            return {"safe": None, "reason": "Account not found"}
+
+        # Direct indexing — one path through the jsonParsed layout instead of
+        # a chain of .get() fallbacks allocating empty dicts. An account that
+        # doesn't have this shape isn't a parsed SPL mint.
+        try:
+            info = value["data"]["parsed"]["info"]
+        except (KeyError, TypeError):
+            return {"safe": False, "reason": "Not a parsed SPL mint"}
+
+        mint_authority = info.get("mintAuthority")
+        freeze_authority = info.get("freezeAuthority")
+        supply = info.get("supply", "0")
+        decimals = info.get("decimals", 0)
+
+        return {
+            "safe": mint_authority is None and freeze_authority is None,
+            "mint_authority": mint_authority,
+            "freeze_authority": freeze_authority,
+            "supply": int(supply),
+            "decimals": decimals,
+            "reasons": self._build_reasons(mint_authority, freeze_authority),
+        }
+
     async def check_mint(self, mint_address: str) -> dict:
         """
         Fetch SPL token mint info via getAccountInfo(jsonParsed).
@@ -48,60 +127,53 @@ class SolSafetyChecker:
             decimals: int
             reasons: list[str] — why it's unsafe (if any)
         """
-        await self._ensure_session()
+        try:
+            data = await self._post({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getAccountInfo",
+                "params": [mint_address, RPC_ACCOUNT_OPTS],
+            })
+            return self._parse_mint_account(data.get("result", {}).get("value"))
+
+        except Exception as e:
+            logger.debug(
+                f"Solana safety check failed for {mint_address[:8]}...: {e}"
+            )
+            return {"safe": None, "reason": f"RPC error: {e}"}
 
-        # Rate limit: min 100ms between RPC calls
-        import time
-        async with self._lock:
-            now = time.time()
-            wait = 0.1 - (now - self._last_call)
-            if wait > 0:
-                await asyncio.sleep(wait)
+    async def check_mints(self, mint_addresses: list[str]) -> dict[str, dict]:
+        """
+        Batch version of check_mint via getMultipleAccounts(jsonParsed).
 
+        One RPC round-trip per MAX_MULTIPLE_ACCOUNTS mints instead of one
+        per mint. Returns {mint_address: result} with the same result shape
+        as check_mint().
+        """
+        results: dict[str, dict] = {}
+        for i in range(0, len(mint_addresses), MAX_MULTIPLE_ACCOUNTS):
+            chunk = mint_addresses[i:i + MAX_MULTIPLE_ACCOUNTS]
             try:
-                async with self._session.post(
-                    self.rpc_http,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "getAccountInfo",
-                        "params": [
-                            mint_address,
-                            {"encoding": "jsonParsed"},
-                        ],
-                    },
-                ) as resp:
-                    self._last_call = time.time()
-                    data = await resp.json()
-
-                result = data.get("result", {})
-                value = result.get("value")
-
-                if value is None:
-                    return {"safe": False, "reason": "Account not found"}
-
-                parsed = value.get("data", {}).get("parsed", {})
-                info = parsed.get("info", {})
-
-                mint_authority = info.get("mintAuthority")
-                freeze_authority = info.get("freezeAuthority")
-                supply = info.get("supply", "0")
-                decimals = info.get("decimals", 0)
-
-                return {
-                    "safe": mint_authority is None and freeze_authority is None,
-                    "mint_authority": mint_authority,
-                    "freeze_authority": freeze_authority,
-                    "supply": int(supply),
-                    "decimals": decimals,
-                    "reasons": self._build_reasons(mint_authority, freeze_authority),
-                }
+                data = await self._post({
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getMultipleAccounts",
+                    "params": [chunk, RPC_ACCOUNT_OPTS],
+                })
+                values = data.get("result", {}).get("value")
+                if values is None or len(values) != len(chunk):
+                    raise ValueError(data.get("error") or "malformed response")
+                # Response values are positional — same order as the request
+                for mint, value in zip(chunk, values):
+                    results[mint] = self._parse_mint_account(value)
 
             except Exception as e:
                 logger.debug(
-                    f"Solana safety check failed for {mint_address[:8]}...: {e}"
+                    f"Solana batch safety check failed for {len(chunk)} mints: {e}"
                 )
-                return {"safe": None, "reason": f"RPC error: {e}"}
+                for mint in chunk:
+                    results[mint] = {"safe": None, "reason": f"RPC error: {e}"}
+        return results
 
     @staticmethod
     def _build_reasons(mint_auth, freeze_auth) -> list[str]:
@@ -113,37 +185,57 @@ class SolSafetyChecker:
         return reasons
 
 
+def _apply_result(state, result: dict) -> None:
+    """Copy a check_mint()/check_mints() result onto a SolTokenState."""
+    if "mint_authority" not in result:
+        # RPC error or account not found (safe=None) — no authority data,
+        # so don't let update_safety() read it as "revoked"
+        state.bytecode_safe = result.get("safe")
+        return
+    state.mint_authority = result.get("mint_authority")
+    state.freeze_authority = result.get("freeze_authority")
+    state.update_safety()
+
+    if state.bytecode_safe is False:
+        reasons = result.get("reasons", [])
+        logger.info(
+            f"[sol-unsafe] {state.token_address[:8]}... — "
+            f"{', '.join(reasons[:3])}"
+        )
+    elif state.bytecode_safe is True:
+        logger.debug(
+            f"[sol-safe] {state.token_address[:8]}... authorities revoked"
+        )
+
+
 async def run_sol_safety_check(checker: SolSafetyChecker, state) -> None:
     """
     Background safety check for a Solana token.
     Updates state.bytecode_safe, state.mint_authority, state.freeze_authority.
+
+    Timeouts come from the session's ClientTimeout; check_mint() turns them
+    into an RPC-error result, so no extra wait_for timer is needed here.
     """
     try:
-        result = await asyncio.wait_for(
-            checker.check_mint(state.token_address),
-            timeout=10.0,
-        )
-
-        state.mint_authority = result.get("mint_authority")
-        state.freeze_authority = result.get("freeze_authority")
-        state.update_safety()
-
-        if state.bytecode_safe is False:
-            reasons = result.get("reasons", [])
-            logger.info(
-                f"[sol-unsafe] {state.token_address[:8]}... — "
-                f"{', '.join(reasons[:3])}"
-            )
-        elif state.bytecode_safe is True:
-            logger.debug(
-                f"[sol-safe] {state.token_address[:8]}... authorities revoked"
-            )
-
-    except asyncio.TimeoutError:
-        logger.debug(
-            f"Solana safety check timed out for {state.token_address[:8]}..."
-        )
-        state.bytecode_safe = None
+        result = await checker.check_mint(state.token_address)
+        _apply_result(state, result)
     except Exception as e:
         logger.debug(f"Solana safety check failed: {e}")
         state.bytecode_safe = None
+
+
+async def run_sol_safety_checks(checker: SolSafetyChecker, states: list) -> None:
+    """
+    Batched background safety check for several Solana tokens at once.
+    Same per-state updates as run_sol_safety_check().
+    """
+    if not states:
+        return
+    try:
+        results = await checker.check_mints([s.token_address for s in states])
+        for state in states:
+            _apply_result(state, results.get(state.token_address, {}))
+    except Exception as e:
+        logger.debug(f"Solana batch safety check failed: {e}")
+        for state in states:
+            state.bytecode_safe = None
@@ -4,14 +4,18 @@ Solana token state tracker.
 Mirrors the EVM TokenState interface so the shared SignalEngine
 works identically for both chains without branching.
 """
+import asyncio
 import time
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 
+import config
+
 logger = logging.getLogger("sol_state")
 
 
-@dataclass
+@dataclass(slots=True)
 class SolTokenState:
     """
     Token state for Solana tokens.
@@ -56,7 +60,7 @@ class SolTokenState:
     ds_buys_m5: int | None = None
     ds_sells_m5: int | None = None
     ds_volume_m5: float | None = None
-    ds_last_fetch: float = 0.0
+    ds_last_fetch: float = 0.0  # time.monotonic() of the last DexScreener poll
 
     # ── Token identity (from DexScreener) ───────────────────
     token_name: str = ""
@@ -70,12 +74,19 @@ class SolTokenState:
     signal_time: float = 0.0
 
     # ── Swap timestamps for momentum detection ──────────────
-    recent_buy_times: list = field(default_factory=list)
-    recent_sell_times: list = field(default_factory=list)
+    recent_buy_times: deque = field(default_factory=deque)
+    recent_sell_times: deque = field(default_factory=deque)
+    buy_burst_seen: bool = False  # latched by record_buy: ≥ 2 buys within 30s
 
     # ── Dump alert state ────────────────────────────────────
     dump_alerted: bool = False
 
+    # ── Chain flag, derived once from dex_version ───────────
+    is_solana: bool = field(default=True, init=False)
+
+    def __post_init__(self):
+        self.is_solana = self.dex_version.startswith("solana")
+
     @property
     def age_seconds(self) -> float:
         return time.time() - self.first_seen
@@ -98,11 +109,18 @@ class SolTokenState:
             return max(self.total_buys, self.ds_buys_m5)
         return self.total_buys
 
+    def recent_sell_count(self, now: float) -> int:
+        """Sells in the last 60s. Drops expired timestamps from the head first,
+        so the count is O(expired) rather than a scan of the window."""
+        sell_times = self.recent_sell_times
+        cutoff = now - 60
+        while sell_times and sell_times[0] <= cutoff:
+            sell_times.popleft()
+        return len(sell_times)
+
     def has_momentum(self) -> bool:
         """Check optional momentum conditions (any one = True)."""
-        now = time.time()
-        recent = [t for t in self.recent_buy_times if now - t <= 30]
-        if len(recent) >= 2:
+        if self.buy_burst_seen:
             return True
         liq = self.best_liquidity
         if liq > 0 and self.buy_volume_usd >= liq * 0.20:
@@ -130,7 +148,11 @@ class SolTokenStateTracker:
     def __init__(self, max_age: int = 200):
         self.states: dict[str, SolTokenState] = {}
         self.max_age = max_age
-        self._deployer_history: dict[str, dict[str, float]] = {}  # deployer -> {token -> timestamp}
+        # deployer -> (deque of (timestamp, token) in arrival order, set of tokens in window)
+        self._deployer_history: dict[str, tuple[deque, set]] = {}
+        # Signaled states whose 60s sell count reached DUMP_SELL_THRESHOLD
+        # (set by main; each state is queued once)
+        self.dump_queue: asyncio.Queue | None = None
 
     def get(self, token_address: str) -> SolTokenState | None:
         state = self.states.get(token_address)
@@ -177,9 +199,14 @@ class SolTokenStateTracker:
         state.buy_volume_usd += amount_usd
         state.largest_buy_usd = max(state.largest_buy_usd, amount_usd)
         state.unique_buyers.add(buyer)
-        state.recent_buy_times.append(time.time())
-        cutoff = time.time() - 60
-        state.recent_buy_times = [t for t in state.recent_buy_times if t > cutoff]
+        now = time.time()
+        buy_times = state.recent_buy_times
+        buy_times.append(now)
+        cutoff = now - 60
+        while buy_times and buy_times[0] <= cutoff:
+            buy_times.popleft()
+        if len(buy_times) >= 2 and now - buy_times[-2] <= 30:
+            state.buy_burst_seen = True
         return state
 
     def record_sell(self, token_address: str) -> SolTokenState | None:
@@ -188,33 +215,52 @@ class SolTokenStateTracker:
             return None
         state.total_sells += 1
         now = time.time()
-        state.recent_sell_times.append(now)
+        sell_times = state.recent_sell_times
+        sell_times.append(now)
         cutoff = now - 60
-        state.recent_sell_times = [t for t in state.recent_sell_times if t > cutoff]
+        while sell_times and sell_times[0] <= cutoff:
+            sell_times.popleft()
+        # Event-driven dump detection: the threshold can only be crossed here
+        if (
+            self.dump_queue is not None
+            and state.signaled
+            and not state.dump_alerted
+            and len(sell_times) >= config.DUMP_SELL_THRESHOLD
+        ):
+            state.dump_alerted = True
+            self.dump_queue.put_nowait(state)
         return state
 
     def record_deployer(self, deployer: str, token_address: str) -> int:
         """Track deployer activity. Idempotent per (deployer, token) pair.
         Returns number of unique tokens by this deployer in last 24h."""
         now = time.time()
-        if deployer not in self._deployer_history:
-            self._deployer_history[deployer] = {}
+        history = self._deployer_history.get(deployer)
+        if history is None:
+            history = self._deployer_history[deployer] = (deque(), set())
+        order, tokens = history
         # Only record once per token (idempotent across multiple evaluate() calls)
-        if token_address not in self._deployer_history[deployer]:
-            self._deployer_history[deployer][token_address] = now
-        # Count unique tokens in last 24h
+        if token_address not in tokens:
+            order.append((now, token_address))
+            tokens.add(token_address)
+        # Count unique tokens in last 24h — expire from the oldest end
         cutoff = now - 86400
-        self._deployer_history[deployer] = {
-            tok: ts for tok, ts in self._deployer_history[deployer].items() if ts > cutoff
-        }
-        return len(self._deployer_history[deployer])
+        while order and order[0][0] <= cutoff:
+            tokens.discard(order.popleft()[1])
+        return len(tokens)
 
     def evict_stale(self):
-        """Remove tokens older than max_age."""
-        stale = [
-            addr for addr, state in self.states.items()
-            if time.time() - state.first_seen > self.max_age
-        ]
+        """Remove tokens older than max_age.
+
+        States are inserted by create() in first_seen order, so the dict's
+        insertion order is age order — stop at the first fresh entry.
+        """
+        cutoff = time.time() - self.max_age
+        stale = []
+        for addr, state in self.states.items():
+            if state.first_seen >= cutoff:
+                break
+            stale.append(addr)
         for addr in stale:
             del self.states[addr]
         if stale:
@@ -14,14 +14,162 @@ Can run alongside the Based Bot sender (dual output) or replace it entirely.
 import asyncio
 import logging
 import time
+from collections import deque
+from functools import lru_cache
 from typing import Optional
 
 import aiohttp
+import orjson
+from yarl import URL
 
 import config
+import http_pool
 
 logger = logging.getLogger("tg_bot")
 
+# Signal bursts: signals already waiting in the queue go out as one message
+COALESCE_MAX = 10
+TG_MAX_MESSAGE_LEN = 4096
+# Concurrent sendMessage POSTs across chats (Telegram's global cap is
+# ~30 msg/s per bot); messages to one chat are always posted in order
+TG_MAX_IN_FLIGHT = 5
+# Outbound messages drained from the out-queue per dispatch round
+OUT_BATCH_MAX = 20
+# Restart backoff for a consumer loop that crashes (doubles up to the max)
+RESTART_BACKOFF_S = 1.0
+RESTART_BACKOFF_MAX_S = 60.0
+_SIGNAL_SEPARATOR = "\n\n━━━━━━━━━━━━━━━\n\n"
+
+# parse_mode=HTML: token names/symbols come from DexScreener and can contain
+# markup characters. A precompiled translate table escapes them in one C pass.
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def _html(text: str) -> str:
+    """Escape text for Telegram parse_mode=HTML."""
+    return text.translate(_HTML_ESCAPE)
+
+
+# ── Message templates (built once, filled with str.format per send) ──
+_RULE = "━" * 28
+
+_DEXSCREENER_URL = {
+    "base": "https://dexscreener.com/base/",
+    "solana": "https://dexscreener.com/solana/",
+}
+_EXPLORER_URL = {
+    "base": "https://basescan.org/token/",
+    "solana": "https://solscan.io/token/",
+}
+_CHAIN_EMOJI = {"base": "🔵", "solana": "🟣"}
+_CHAIN_NAME = {"base": "Base", "solana": "Solana"}
+
+_POST_MORTEM_EMOJI = {
+    "TP_HIT": "🟢", "IMPULSE": "📈", "FLAT": "➖",
+    "DUMP": "📉", "RUG": "🔴", "CHOP": "↔️",
+}
+
+
+@lru_cache(maxsize=4096)
+def _links(chain: str, token: str) -> tuple[str, str]:
+    """(DexScreener URL, explorer URL) for a token — built once per token."""
+    chain = "solana" if chain == "solana" else "base"
+    return _DEXSCREENER_URL[chain] + token, _EXPLORER_URL[chain] + token
+
+
+def _link_keyboard(chain: str, token: str) -> dict:
+    """Inline keyboard with DexScreener + explorer buttons ("solana" or Base).
+
+    Built fresh per message from the cached _links() strings, so callers
+    own the dict and no mutable structure is shared between messages.
+    """
+    ds_link, explorer_link = _links(chain, token)
+    return {
+        "inline_keyboard": [
+            [
+                {"text": "📊 DexScreener", "url": ds_link},
+                {"text": "🔍 Explorer", "url": explorer_link},
+            ],
+        ]
+    }
+
+
+def _link_row(chain: str, token: str, label: str) -> list[dict]:
+    """One keyboard row of link buttons tagged with `label`, for combined messages."""
+    ds_link, explorer_link = _links(chain, token)
+    return [
+        {"text": f"📊 {label}", "url": ds_link},
+        {"text": f"🔍 {label}", "url": explorer_link},
+    ]
+
+
+_SIGNAL_TMPL = (
+    "🎯 <b>SIGNAL</b> {chain_emoji} {chain_name}{name_tag}{social_tag}\n"
+    f"{_RULE}\n\n"
+    "<code>{ca}</code>\n\n"
+    "├ Mcap: <b>${mcap:,.0f}</b>\n"
+    "├ Liq: <b>${liq:,.0f}</b>\n"
+    "├ Buys: <b>{buys}</b> ({unique} unique) · Sells: {sells}\n"
+    "├ Vol: ${volume:,.0f}\n"
+    "├ Top buy: ${largest:,.0f} ({largest_pct:.0f}%)\n"
+    "├ Momentum: {momentum}\n"
+    "└ {dex_ver} · {age:.0f}s · latency {latency:.0f}s"
+)
+
+# Minimal message if state was already evicted
+_SIGNAL_MIN_TMPL = (
+    "🎯 <b>SIGNAL</b> {chain_emoji} {chain_name}\n\n"
+    "<code>{ca}</code>"
+)
+
+_WHALE_TMPL = (
+    "{emoji} <b>WHALE {action}</b>{name}\n"
+    f"{_RULE}\n\n"
+    "<code>{token}</code>\n\n"
+    "├ Amount: <b>${usd:,.0f}</b>\n"
+    "└ Wallet: {wallet}"
+)
+
+_DUMP_TMPL = (
+    "🚨 <b>DUMP ALERT</b> {chain_emoji}\n"
+    f"{_RULE}\n\n"
+    "<code>{token}</code>\n\n"
+    "├ Sells in 60s: <b>{sells_60s}</b>\n"
+    "├ Total S/B: <b>{total_sells}/{total_buys}</b>\n"
+    "├ Mcap: ${mcap:,.0f}\n"
+    "└ Liq: ${liq:,.0f}"
+)
+
+_PUMP_TMPL = (
+    "{trend} <b>PUMP DETECTED</b>{name_tag}{social_tag}\n"
+    f"{_RULE}\n\n"
+    "<code>{token}</code>\n\n"
+    "├ Mcap: <b>${mcap:,.0f}</b>\n"
+    "├ Liq: ${liq:,.0f}\n"
+    "├ Vol 1h: ${volume_h1:,.0f}\n"
+    "├ Δ5m: <b>{price_change_m5:+.1f}%</b> · Δ1h: {price_change_h1:+.1f}%\n"
+    "├ Swaps/2m: <b>{swaps}</b>\n"
+    "└ Age: {age_str}"
+    "{signal_line}"
+)
+
+_DISCOVERY_TMPL = (
+    "📡 <b>NEW PAIR</b>{title}\n"
+    "<code>{token}</code>\n"
+    "{info}\n"
+    "{metrics}\n"
+    "{status}"
+)
+
+_POST_MORTEM_TMPL = (
+    "{emoji} <b>POST-MORTEM: {outcome}</b>\n\n"
+    "<code>{token_short}...</code>\n"
+    "├ Mcap at signal: ${mcap_signal:,.0f}\n"
+    "├ Mcap at 10m: ${mcap_10m:,.0f}\n"
+    "├ Change: <b>{change:+.1f}%</b>\n"
+    "└ Latency: {latency:.0f}s"
+)
+
 
 class SignalBot:
     """
@@ -29,23 +177,44 @@ class SignalBot:
     Consumes from the shared signal_queue (same as TelegramSender).
     """
 
-    def __init__(self, signal_queue: asyncio.Queue, state_tracker=None, sol_state_tracker=None, whale_queue=None, pump_queue=None, discovery_queue=None):
+    __slots__ = (
+        "signal_queue", "whale_queue", "pump_queue", "discovery_queue",
+        "tracker", "sol_tracker",
+        "_session", "_owns_session", "_bot_token", "_chat_id", "_api_base",
+        "_url_get_me", "_url_send", "_send_sem", "_pause", "_inflight",
+        "_out_queue", "_flush_task",
+    )
+
+    def __init__(self, signal_queue: asyncio.Queue, state_tracker=None, sol_state_tracker=None, whale_queue=None, pump_queue=None, discovery_queue=None, session: Optional[aiohttp.ClientSession] = None):
         self.signal_queue = signal_queue
         self.whale_queue = whale_queue
         self.pump_queue = pump_queue  # kept for interface compatibility (unused without volume scanner)
         self.discovery_queue = discovery_queue
         self.tracker = state_tracker
         self.sol_tracker = sol_state_tracker
-        self._session: Optional[aiohttp.ClientSession] = None
+        # Injected session (shared pool) is owned by the caller; otherwise
+        # we create and close our own
+        self._session = session
+        self._owns_session = session is None
         self._bot_token = config.BOT_TOKEN
         self._chat_id = config.BOT_CHAT_ID
         self._api_base = f"https://api.telegram.org/bot{self._bot_token}"
+        # Parsed once; aiohttp reuses a URL object as-is instead of re-parsing
+        self._url_get_me = URL(f"{self._api_base}/getMe")
+        self._url_send = URL(f"{self._api_base}/sendMessage")
+        self._send_sem = asyncio.Semaphore(TG_MAX_IN_FLIGHT)
+        # Cleared while Telegram has us rate limited (429 retry_after)
+        self._pause = asyncio.Event()
+        self._pause.set()
+        self._inflight: set[asyncio.Task] = set()
+        # Every outbound message goes through this queue; _flush_loop posts them
+        self._out_queue: asyncio.Queue = asyncio.Queue()
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def _ensure_session(self):
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
+            self._session = http_pool.new_session()
+            self._owns_session = True
 
     async def start(self):
         """Verify bot token, then start consuming signals."""
@@ -57,12 +226,13 @@ class SignalBot:
             return
 
         await self._ensure_session()
+        self._flush_task = asyncio.create_task(self._flush_loop())
 
         # Verify bot token works
         try:
-            async with self._session.get(f"{self._api_base}/getMe") as resp:
+            async with self._session.get(self._url_get_me) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await resp.json(loads=orjson.loads)
                     bot_name = data.get("result", {}).get("username", "unknown")
                     logger.info(f"Personal TG bot connected: @{bot_name}")
                 else:
@@ -82,127 +252,185 @@ class SignalBot:
             f"Min liq: ${config.MIN_LIQUIDITY_USD:,.0f}"
         )
 
-        # Consume signals + whale alerts + pump alerts + discovery feed
-        tasks = [asyncio.create_task(self._send_loop())]
-        if self.whale_queue:
-            tasks.append(asyncio.create_task(self._whale_loop()))
-        if self.pump_queue:
-            tasks.append(asyncio.create_task(self._pump_loop()))
-        if self.discovery_queue:
-            tasks.append(asyncio.create_task(self._discovery_loop()))
-        await asyncio.gather(*tasks)
+        # Consume signals + whale alerts + pump alerts + discovery feed.
+        # Each loop is supervised, so one crashing doesn't stop the others.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._supervise("send", self._send_loop))
+            if self.whale_queue:
+                tg.create_task(self._supervise("whale", self._whale_loop))
+            if self.pump_queue:
+                tg.create_task(self._supervise("pump", self._pump_loop))
+            if self.discovery_queue:
+                tg.create_task(self._supervise("discovery", self._discovery_loop))
+
+    async def _supervise(self, name: str, loop_fn):
+        """Run a consumer loop, restarting it with exponential backoff if it raises."""
+        backoff = RESTART_BACKOFF_S
+        while True:
+            try:
+                await loop_fn()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Bot {name} loop crashed: {e} — restarting in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RESTART_BACKOFF_MAX_S)
 
     async def _send_loop(self):
-        """Consume from signal queue and send formatted alerts."""
+        """Consume from signal queue and send formatted alerts.
+
+        A signal is dispatched as soon as it arrives; any others already
+        waiting in the queue go out with it as one message (Telegram allows
+        ~1 msg/s per chat). Nothing waits for more signals to show up.
+        """
         while True:
             try:
-                contract_address = await self.signal_queue.get()
-                await self._send_signal(contract_address)
-                self.signal_queue.task_done()
+                batch = [await self.signal_queue.get()]
+                while len(batch) < COALESCE_MAX and not self.signal_queue.empty():
+                    batch.append(self.signal_queue.get_nowait())
+                # Send in the background so the next batch can be collected
+                # while this one's POST is in flight
+                if len(batch) == 1:
+                    task = asyncio.create_task(self._send_signal(batch[0]))
+                else:
+                    task = asyncio.create_task(self._send_signal_batch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(
+                    lambda t, n=len(batch): self._on_signal_sent(t, n)
+                )
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Bot send loop error: {e}")
                 await asyncio.sleep(1)
 
+    def _on_signal_sent(self, task: asyncio.Task, count: int):
+        """Done-callback for a background signal send: ack the queue, log failures."""
+        self._inflight.discard(task)
+        for _ in range(count):
+            self.signal_queue.task_done()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Bot signal send error: {task.exception()}")
+
     async def _send_signal(self, contract_address: str):
-        """Build and send a rich signal message with inline keyboard buttons."""
-        # Look up state from tracker for extra context
-        state = None
-        chain = "base"
-
-        if self.tracker:
-            state = self.tracker.get(contract_address)
-        if state is None and self.sol_tracker:
-            state = self.sol_tracker.get(contract_address)
-            if state:
-                chain = "solana"
-
-        # Chain-specific links
-        if chain == "solana":
-            explorer_link = f"https://solscan.io/token/{contract_address}"
-            ds_link = f"https://dexscreener.com/solana/{contract_address}"
-            chain_emoji = "🟣"
-            chain_name = "Solana"
+        """Build and queue a rich signal message with inline keyboard buttons."""
+        message, chain, _ = self._build_signal(contract_address)
+        await self._send_message(message, reply_markup=_link_keyboard(chain, contract_address))
+        # Delivery happens in _flush_loop; _post_message logs any failure
+        logger.info(f"[bot] Signal queued for chat {self._chat_id}: {contract_address[:16]}...")
+
+    async def _send_signal_batch(self, contract_addresses: list[str]):
+        """Queue several signals as combined messages (split at Telegram's length limit)."""
+        texts: list[str] = []
+        rows: list[list] = []
+        size = 0
+        for ca in contract_addresses:
+            message, chain, label = self._build_signal(ca)
+            added = len(message) + (len(_SIGNAL_SEPARATOR) if texts else 0)
+            if texts and size + added > TG_MAX_MESSAGE_LEN:
+                await self._send_message(
+                    _SIGNAL_SEPARATOR.join(texts), reply_markup={"inline_keyboard": rows}
+                )
+                texts, rows = [], []
+                added = len(message)
+                size = 0
+            texts.append(message)
+            # One labelled row per token so the buttons map to their signal
+            rows.append(_link_row(chain, ca, label))
+            size += added
+        if texts:
+            await self._send_message(
+                _SIGNAL_SEPARATOR.join(texts), reply_markup={"inline_keyboard": rows}
+            )
+        logger.info(
+            f"[bot] {len(contract_addresses)} signals queued for chat {self._chat_id} (coalesced)"
+        )
+
+    def _build_signal(self, contract_address: str) -> tuple[str, str, str]:
+        """Build the signal message text for one token.
+
+        Returns (message, chain, label); label names the token on the link
+        buttons of a combined message ($SYMBOL, or the CA prefix).
+        """
+        # Look up state from the tracker for extra context. The CA format
+        # identifies the chain (EVM = 0x-hex, Solana = base58), so only one
+        # tracker is queried.
+        if contract_address.startswith("0x"):
+            chain = "base"
+            state = self.tracker.get(contract_address) if self.tracker else None
         else:
-            explorer_link = f"https://basescan.org/token/{contract_address}"
-            ds_link = f"https://dexscreener.com/base/{contract_address}"
-            chain_emoji = "🔵"
-            chain_name = "Base"
+            chain = "solana"
+            state = self.sol_tracker.get(contract_address) if self.sol_tracker else None
 
-        # Inline keyboard: one-tap DexScreener, Explorer, copy-ready CA
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📊 DexScreener", "url": ds_link},
-                    {"text": "🔍 Explorer", "url": explorer_link},
-                ],
-            ]
-        }
+        chain_emoji = _CHAIN_EMOJI[chain]
+        chain_name = _CHAIN_NAME[chain]
+        label = f"${state.token_symbol}" if state and state.token_symbol else f"{contract_address[:8]}…"
 
-        if state:
-            age = state.age_seconds
-            mcap = state.best_mcap
-            liq = state.best_liquidity
-            buys = state.best_buys
-            sells = state.total_sells
-            volume = state.buy_volume_usd
-            largest = state.largest_buy_usd
-            largest_pct = (largest / liq * 100) if liq > 0 else 0
-            unique = len(state.unique_buyers)
-            momentum = state.has_momentum()
-            dex_ver = state.dex_version
-            latency = time.time() - state.first_seen
-
-            # Header: show name + symbol if available
-            if state.token_name and state.token_symbol:
-                name_tag = f" {state.token_name} (${state.token_symbol})"
-            elif state.token_symbol:
-                name_tag = f" ${state.token_symbol}"
-            elif state.token_name:
-                name_tag = f" {state.token_name}"
-            else:
-                name_tag = ""
-            social_tag = "" if state.has_socials else " ⚠️no-socials"
-
-            message = (
-                f"🎯 <b>SIGNAL</b> {chain_emoji} {chain_name}{name_tag}{social_tag}\n"
-                f"{'━' * 28}\n\n"
-                f"<code>{contract_address}</code>\n\n"
-                f"├ Mcap: <b>${mcap:,.0f}</b>\n"
-                f"├ Liq: <b>${liq:,.0f}</b>\n"
-                f"├ Buys: <b>{buys}</b> ({unique} unique) · Sells: {sells}\n"
-                f"├ Vol: ${volume:,.0f}\n"
-                f"├ Top buy: ${largest:,.0f} ({largest_pct:.0f}%)\n"
-                f"├ Momentum: {'✅' if momentum else '❌'}\n"
-                f"└ {dex_ver} · {age:.0f}s · latency {latency:.0f}s"
+        if state is None:
+            message = _SIGNAL_MIN_TMPL.format(
+                chain_emoji=chain_emoji, chain_name=chain_name, ca=_html(contract_address)
             )
+            return message, chain, label
+
+        liq = state.best_liquidity
+        largest = state.largest_buy_usd
+
+        # Header: show name + symbol if available
+        token_name = _html(state.token_name) if state.token_name else ""
+        token_symbol = _html(state.token_symbol) if state.token_symbol else ""
+        if token_name and token_symbol:
+            name_tag = f" {token_name} (${token_symbol})"
+        elif token_symbol:
+            name_tag = f" ${token_symbol}"
+        elif token_name:
+            name_tag = f" {token_name}"
         else:
-            # Minimal message if state was already evicted
-            message = (
-                f"🎯 <b>SIGNAL</b> {chain_emoji} {chain_name}\n\n"
-                f"<code>{contract_address}</code>"
-            )
+            name_tag = ""
 
-        await self._send_message(message, reply_markup=keyboard)
-        logger.info(f"[bot] Signal sent to chat {self._chat_id}: {contract_address[:16]}...")
+        message = _SIGNAL_TMPL.format(
+            chain_emoji=chain_emoji,
+            chain_name=chain_name,
+            name_tag=name_tag,
+            social_tag="" if state.has_socials else " ⚠️no-socials",
+            ca=_html(contract_address),
+            mcap=state.best_mcap,
+            liq=liq,
+            buys=state.best_buys,
+            unique=len(state.unique_buyers),
+            sells=state.total_sells,
+            volume=state.buy_volume_usd,
+            largest=largest,
+            largest_pct=largest * 100 / liq if liq else 0.0,
+            momentum="✅" if state.has_momentum() else "❌",
+            dex_ver=state.dex_version,
+            age=state.age_seconds,
+            latency=time.time() - state.first_seen,
+        )
+        return message, chain, label
 
     async def _whale_loop(self):
         """Consume whale alert events and send notifications."""
         # Debounce: max 1 whale alert per token per 30s
         _last_alert: dict[str, float] = {}
+        # Alert times in send order, so expired entries are pruned from the head
+        _alert_order: deque[tuple[str, float]] = deque()
         while True:
             try:
                 event = await self.whale_queue.get()
                 token = event["token"]
-                now = time.time()
+                now = time.monotonic()
                 # Debounce
                 if token in _last_alert and now - _last_alert[token] < 30:
                     self.whale_queue.task_done()
                     continue
                 _last_alert[token] = now
-                # Prune old entries
-                _last_alert = {k: v for k, v in _last_alert.items() if now - v < 60}
+                _alert_order.append((token, now))
+                # Prune old entries (a token re-alerted since keeps its newer time)
+                while now - _alert_order[0][1] >= 60:
+                    old_token, sent_at = _alert_order.popleft()
+                    if _last_alert.get(old_token) == sent_at:
+                        del _last_alert[old_token]
                 await self._send_whale_alert(event)
                 self.whale_queue.task_done()
             except asyncio.CancelledError:
@@ -218,36 +446,21 @@ class SignalBot:
         is_buy = event["is_buy"]
         usd = event["usd"]
         sender = event.get("sender", "?")
-        symbol = event.get("symbol", "")
+        symbol = _html(event.get("symbol", ""))
 
         emoji = "🐋💚" if is_buy else "🐋🔴"
         action = "BUY" if is_buy else "SELL"
         name = f" ${symbol}" if symbol else ""
 
-        if chain == "solana":
-            ds_link = f"https://dexscreener.com/solana/{token}"
-            explorer_link = f"https://solscan.io/token/{token}"
-        else:
-            ds_link = f"https://dexscreener.com/base/{token}"
-            explorer_link = f"https://basescan.org/token/{token}"
-
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📊 DexScreener", "url": ds_link},
-                    {"text": "🔍 Explorer", "url": explorer_link},
-                ],
-            ]
-        }
-
-        message = (
-            f"{emoji} <b>WHALE {action}</b>{name}\n"
-            f"{'━' * 28}\n\n"
-            f"<code>{token}</code>\n\n"
-            f"├ Amount: <b>${usd:,.0f}</b>\n"
-            f"└ Wallet: {sender[:8]}..{sender[-4:]}"
+        message = _WHALE_TMPL.format(
+            emoji=emoji,
+            action=action,
+            name=name,
+            token=token,
+            usd=usd,
+            wallet=f"{sender[:8]}..{sender[-4:]}",
         )
-        await self._send_message(message, reply_markup=keyboard)
+        await self._send_message(message, reply_markup=_link_keyboard(chain, token))
 
     async def _send_message(
         self,
@@ -255,50 +468,100 @@ class SignalBot:
         disable_preview: bool = True,
         reply_markup: dict | None = None,
     ):
-        """Send a message via Telegram Bot API."""
+        """Queue a message for the Telegram Bot API (posted by _flush_loop)."""
+        payload: dict = {
+            "chat_id": self._chat_id,
+            "text": text,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": disable_preview,
+        }
+        if reply_markup:
+            payload["reply_markup"] = reply_markup
+        self._out_queue.put_nowait(payload)
+
+    async def _flush_loop(self):
+        """Drain the out-queue and post each round's messages.
+
+        Messages for one chat are posted one after another in queue order, so
+        a signal never lands before the startup message or a dump alert
+        before its signal. Different chats are posted concurrently, bounded
+        by TG_MAX_IN_FLIGHT.
+        """
+        while True:
+            try:
+                batch = [await self._out_queue.get()]
+                while len(batch) < OUT_BATCH_MAX and not self._out_queue.empty():
+                    batch.append(self._out_queue.get_nowait())
+                by_chat: dict[str, list[dict]] = {}
+                for payload in batch:
+                    by_chat.setdefault(payload["chat_id"], []).append(payload)
+                try:
+                    await asyncio.gather(*(self._post_in_order(p) for p in by_chat.values()))
+                finally:
+                    for _ in batch:
+                        self._out_queue.task_done()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Bot flush loop error: {e}")
+                await asyncio.sleep(1)
+
+    async def _post_in_order(self, payloads: list[dict]):
+        """Post one chat's messages sequentially, preserving queue order."""
+        for payload in payloads:
+            await self._post_message(payload)
+
+    async def _post_message(self, payload: dict):
+        """POST one sendMessage payload, retrying once after a 429 flood wait."""
         await self._ensure_session()
         try:
-            payload: dict = {
-                "chat_id": self._chat_id,
-                "text": text,
-                "parse_mode": "HTML",
-                "disable_web_page_preview": disable_preview,
-            }
-            if reply_markup:
-                payload["reply_markup"] = reply_markup
-            async with self._session.post(
-                f"{self._api_base}/sendMessage",
-                json=payload,
-            ) as resp:
-                if resp.status != 200:
-                    data = await resp.json()
-                    logger.error(f"Bot send failed: {data}")
+            for _ in range(2):
+                await self._pause.wait()
+                async with self._send_sem, self._session.post(
+                    self._url_send, json=payload
+                ) as resp:
+                    if resp.status == 200:
+                        return
+                    data = await resp.json(loads=orjson.loads)
+                retry_after = (
+                    data.get("parameters", {}).get("retry_after", 0)
+                    if resp.status == 429 else 0
+                )
+                if not retry_after:
+                    break
+                await self._flood_wait(retry_after)
+            logger.error(f"Bot send failed: {data}")
         except Exception as e:
             logger.error(f"Bot send error: {e}")
 
-    async def send_post_mortem(self, record: dict):
-        """Send a post-mortem follow-up notification."""
+    async def _flood_wait(self, retry_after: float):
+        """Pause every sender until Telegram's retry_after has elapsed."""
+        if not self._pause.is_set():
+            # Another send already hit the 429 — just wait out its pause
+            await self._pause.wait()
+            return
+        logger.warning(f"Telegram flood wait: {retry_after}s")
+        self._pause.clear()
+        try:
+            await asyncio.sleep(retry_after + 0.5)
+        finally:
+            self._pause.set()
+
+    async def send_post_mortem(self, record):
+        """Send a post-mortem follow-up notification for a PostMortemRecord."""
         if not self._bot_token or not self._chat_id:
             return
 
-        token = record["token"]
-        chain = record.get("chain", "base")
-        outcome = record.get("outcome", "UNKNOWN")
-        change = record.get("price_change_pct", 0)
-        mcap_signal = record.get("mcap_at_signal", 0)
-        mcap_10m = record.get("mcap_10m", 0)
-        latency = record.get("latency_s", 0)
-
-        emoji_map = {
-            "TP_HIT": "🟢", "IMPULSE": "📈", "FLAT": "➖",
-            "DUMP": "📉", "RUG": "🔴", "CHOP": "↔️",
-        }
-        emoji = emoji_map.get(outcome, "❓")
+        token = record.token
+        chain = record.chain
+        outcome = record.outcome or "UNKNOWN"
+        change = record.price_change_pct
+        mcap_signal = record.mcap_at_signal
+        mcap_10m = record.mcap_10m
+        latency = record.latency_s
 
-        if chain == "solana":
-            ds_link = f"https://dexscreener.com/solana/{token}"
-        else:
-            ds_link = f"https://dexscreener.com/base/{token}"
+        emoji = _POST_MORTEM_EMOJI.get(outcome, "❓")
+        ds_link, _ = _links(chain, token)
 
         keyboard = {
             "inline_keyboard": [
@@ -306,13 +569,14 @@ class SignalBot:
             ]
         }
 
-        message = (
-            f"{emoji} <b>POST-MORTEM: {outcome}</b>\n\n"
-            f"<code>{token[:20]}...</code>\n"
-            f"├ Mcap at signal: ${mcap_signal:,.0f}\n"
-            f"├ Mcap at 10m: ${mcap_10m:,.0f}\n"
-            f"├ Change: <b>{change:+.1f}%</b>\n"
-            f"└ Latency: {latency:.0f}s"
+        message = _POST_MORTEM_TMPL.format(
+            emoji=emoji,
+            outcome=outcome,
+            token_short=token[:20],
+            mcap_signal=mcap_signal,
+            mcap_10m=mcap_10m,
+            change=change,
+            latency=latency,
         )
         await self._send_message(message, reply_markup=keyboard)
 
@@ -330,36 +594,16 @@ class SignalBot:
         if not self._bot_token or not self._chat_id:
             return
 
-        if chain == "solana":
-            ds_link = f"https://dexscreener.com/solana/{token_address}"
-            explorer_link = f"https://solscan.io/token/{token_address}"
-            chain_emoji = "🟣"
-        else:
-            ds_link = f"https://dexscreener.com/base/{token_address}"
-            explorer_link = f"https://basescan.org/token/{token_address}"
-            chain_emoji = "🔵"
-
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📊 DexScreener", "url": ds_link},
-                    {"text": "🔍 Explorer", "url": explorer_link},
-                ],
-            ]
-        }
-
-        sell_buy_ratio = f"{total_sells}/{total_buys}"
-
-        message = (
-            f"🚨 <b>DUMP ALERT</b> {chain_emoji}\n"
-            f"{'━' * 28}\n\n"
-            f"<code>{token_address}</code>\n\n"
-            f"├ Sells in 60s: <b>{sells_60s}</b>\n"
-            f"├ Total S/B: <b>{sell_buy_ratio}</b>\n"
-            f"├ Mcap: ${mcap:,.0f}\n"
-            f"└ Liq: ${liq:,.0f}"
+        message = _DUMP_TMPL.format(
+            chain_emoji=_CHAIN_EMOJI["solana" if chain == "solana" else "base"],
+            token=token_address,
+            sells_60s=sells_60s,
+            total_sells=total_sells,
+            total_buys=total_buys,
+            mcap=mcap,
+            liq=liq,
         )
-        await self._send_message(message, reply_markup=keyboard)
+        await self._send_message(message, reply_markup=_link_keyboard(chain, token_address))
 
     async def _pump_loop(self):
         """Consume volume spike alerts and send formatted notifications."""
@@ -377,8 +621,8 @@ class SignalBot:
     async def _send_pump_alert(self, alert: dict):
         """Send a volume spike / pump detection alert."""
         token = alert.get("token", "?")
-        symbol = alert.get("symbol", "")
-        name = alert.get("name", "")
+        symbol = _html(alert.get("symbol", ""))
+        name = _html(alert.get("name", ""))
         mcap = alert.get("mcap", 0)
         liq = alert.get("liq", 0)
         volume_h1 = alert.get("volume_h1", 0)
@@ -419,41 +663,27 @@ class SignalBot:
             name_tag = ""
         social_tag = " ✅" if has_socials else " ⚠️no-socials"
 
-        if chain == "solana":
-            ds_link = f"https://dexscreener.com/solana/{token}"
-            explorer_link = f"https://solscan.io/token/{token}"
-        else:
-            ds_link = f"https://dexscreener.com/base/{token}"
-            explorer_link = f"https://basescan.org/token/{token}"
-
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📊 DexScreener", "url": ds_link},
-                    {"text": "🔍 Explorer", "url": explorer_link},
-                ],
-            ]
-        }
-
         # Build signal history line if bot previously caught this token
         signal_line = ""
         if signal_mcap is not None:
             multiplier = mcap / signal_mcap if signal_mcap > 0 else 0
             signal_line = f"\n├ 📍 Bot signaled at ${signal_mcap:,.0f} (<b>{multiplier:.1f}x</b> since)"
 
-        message = (
-            f"{trend} <b>PUMP DETECTED</b>{name_tag}{social_tag}\n"
-            f"{'━' * 28}\n\n"
-            f"<code>{token}</code>\n\n"
-            f"├ Mcap: <b>${mcap:,.0f}</b>\n"
-            f"├ Liq: ${liq:,.0f}\n"
-            f"├ Vol 1h: ${volume_h1:,.0f}\n"
-            f"├ Δ5m: <b>{price_change_m5:+.1f}%</b> · Δ1h: {price_change_h1:+.1f}%\n"
-            f"├ Swaps/2m: <b>{swaps}</b>\n"
-            f"└ Age: {age_str}"
-            f"{signal_line}"
+        message = _PUMP_TMPL.format(
+            trend=trend,
+            name_tag=name_tag,
+            social_tag=social_tag,
+            token=token,
+            mcap=mcap,
+            liq=liq,
+            volume_h1=volume_h1,
+            price_change_m5=price_change_m5,
+            price_change_h1=price_change_h1,
+            swaps=swaps,
+            age_str=age_str,
+            signal_line=signal_line,
         )
-        await self._send_message(message, reply_markup=keyboard)
+        await self._send_message(message, reply_markup=_link_keyboard(chain, token))
 
     # ── Discovery Feed ──────────────────────────────────────────
 
@@ -462,70 +692,68 @@ class SignalBot:
         Waits ~15s after pool creation for DexScreener to index the pair,
         giving us token name, symbol, mcap, liquidity, and socials.
         Rate limited: min 5s between messages, max DISCOVERY_MAX_PER_HOUR/hr."""
-        _timestamps: list[float] = []
+        _timestamps: deque[float] = deque()
         _last_send: float = 0.0
         MIN_INTERVAL = 5  # seconds between discovery messages
         MAX_PER_HOUR = config.DISCOVERY_MAX_PER_HOUR
         ENRICHMENT_DELAY = 15  # seconds to wait for DexScreener data
         MIN_DISCOVERY_MCAP = 500  # skip dust/dead pairs (no real buys)
 
-        # Buffer: collect events, process after delay
-        pending: list[tuple[float, dict]] = []  # (arrival_time, event)
+        # Events waiting out the enrichment delay, as (ready_at, event). The
+        # delay is constant, so arrival order is ready order and the head is
+        # always the next one due. Capped to prevent memory growth (oldest dropped).
+        pending: deque[tuple[float, dict]] = deque(maxlen=200)
 
         while True:
             try:
-                # Drain queue without blocking — collect new events
-                while not self.discovery_queue.empty():
-                    try:
-                        event = self.discovery_queue.get_nowait()
-                        pending.append((time.time(), event))
-                        self.discovery_queue.task_done()
-                    except Exception:
-                        break
-
-                # Process events that have aged past the enrichment delay
-                now = time.time()
-                ready = [p for p in pending if now - p[0] >= ENRICHMENT_DELAY]
-                pending = [p for p in pending if now - p[0] < ENRICHMENT_DELAY]
-
-                for arrival_time, event in ready:
-                    # Rate limit: prune old timestamps, check hourly cap
-                    _timestamps = [t for t in _timestamps if now - t < 3600]
-                    if len(_timestamps) >= MAX_PER_HOUR:
-                        continue
-
-                    # Min interval between messages
-                    wait = MIN_INTERVAL - (now - _last_send)
-                    if wait > 0:
-                        await asyncio.sleep(wait)
-
-                    # Check if token has enough data now
-                    token = event.get("token", "")
-                    state = self.tracker.get(token) if self.tracker else None
-                    mcap = state.best_mcap if state else 0
-
-                    # Skip dust/dead pairs — if after 15s still no meaningful mcap, drop it
-                    if mcap < MIN_DISCOVERY_MCAP:
-                        continue
-
-                    await self._send_discovery(event)
-                    _last_send = time.time()
-                    now = _last_send
-                    _timestamps.append(_last_send)
-
-                # Cap pending buffer to prevent memory growth
-                if len(pending) > 200:
-                    pending = pending[-200:]
-
-                await asyncio.sleep(2)
+                # Block on the queue until the head of pending is due —
+                # no polling when idle, no tick latency when an event is ready
+                timeout = max(0.0, pending[0][0] - time.monotonic()) if pending else None
+                try:
+                    event = await asyncio.wait_for(self.discovery_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    pending.append((time.monotonic() + ENRICHMENT_DELAY, event))
+                    self.discovery_queue.task_done()
+                    continue
+
+                _, event = pending.popleft()
+                now = time.monotonic()
+                # Rate limit: prune old timestamps, check hourly cap
+                while _timestamps and now - _timestamps[0] >= 3600:
+                    _timestamps.popleft()
+                if len(_timestamps) >= MAX_PER_HOUR:
+                    continue
+
+                # Min interval between messages
+                wait = MIN_INTERVAL - (now - _last_send)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                # Check if token has enough data now
+                token = event.get("token", "")
+                state = self.tracker.get(token) if self.tracker else None
+                mcap = state.best_mcap if state else 0
+
+                # Skip dust/dead pairs — if after 15s still no meaningful mcap, drop it
+                if mcap < MIN_DISCOVERY_MCAP:
+                    continue
+
+                await self._send_discovery(event, state=state)
+                _last_send = time.monotonic()
+                _timestamps.append(_last_send)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Discovery loop error: {e}")
                 await asyncio.sleep(1)
 
-    async def _send_discovery(self, event: dict):
-        """Send an enriched new-pair discovery notification."""
+    async def _send_discovery(self, event: dict, state=None):
+        """Send an enriched new-pair discovery notification.
+
+        `state` is the tracker entry if the caller already looked it up.
+        """
         token = event.get("token", "?")
         pool = event.get("pool", "")
         dex = event.get("dex", "?")
@@ -533,11 +761,12 @@ class SignalBot:
         hooks = event.get("hooks")
 
         # Look up enriched state
-        state = self.tracker.get(token) if self.tracker else None
+        if state is None and self.tracker:
+            state = self.tracker.get(token)
         mcap = state.best_mcap if state else 0
         liq = state.best_liquidity if state else 0
-        name = state.token_name if state and state.token_name else ""
-        symbol = state.token_symbol if state and state.token_symbol else ""
+        name = _html(state.token_name) if state and state.token_name else ""
+        symbol = _html(state.token_symbol) if state and state.token_symbol else ""
         buys = state.best_buys if state else 0
         sells = state.total_sells if state else 0
         has_socials = state.has_socials if state else False
@@ -566,18 +795,6 @@ class SignalBot:
         # Socials indicator
         social_tag = "🌐" if has_socials else ""
 
-        ds_link = f"https://dexscreener.com/base/{token}"
-        explorer_link = f"https://basescan.org/token/{token}"
-
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📊 DexScreener", "url": ds_link},
-                    {"text": "🔍 Explorer", "url": explorer_link},
-                ],
-            ]
-        }
-
         # Build info lines
         info_parts = [dex.upper()]
         if fee:
@@ -606,21 +823,28 @@ class SignalBot:
             status_parts.append(f"⏱ {age_s:.0f}s")
         status_str = "  ".join(status_parts)
 
-        message = (
-            f"📡 <b>NEW PAIR</b>{title}\n"
-            f"<code>{token}</code>\n"
-            f"{info_str}\n"
-            f"{metrics_str}\n"
-            f"{status_str}"
+        message = _DISCOVERY_TMPL.format(
+            title=title, token=token, info=info_str, metrics=metrics_str, status=status_str
         )
-        await self._send_message(message, reply_markup=keyboard)
+        await self._send_message(message, reply_markup=_link_keyboard("base", token))
 
     async def stop(self):
         """Send offline message and close session."""
-        if self._bot_token and self._chat_id:
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._flush_task:
+            # Let queued messages go out, then stop the flusher
             try:
-                await self._send_message("🔴 <b>Signal Detector Offline</b>")
-            except Exception:
-                pass
-        if self._session and not self._session.closed:
+                await asyncio.wait_for(self._out_queue.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning(f"Bot stopping with {self._out_queue.qsize()} unsent messages")
+            self._flush_task.cancel()
+        if self._bot_token and self._chat_id:
+            await self._post_message({
+                "chat_id": self._chat_id,
+                "text": "🔴 <b>Signal Detector Offline</b>",
+                "parse_mode": "HTML",
+                "disable_web_page_preview": True,
+            })
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
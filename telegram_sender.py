@@ -6,6 +6,7 @@ NOT Telegram Bot API — this uses your personal account, looks like manual usag
 import asyncio
 import logging
 import random
+import time
 
 import config
 
@@ -32,6 +33,7 @@ class TelegramSender:
         self.signal_queue = signal_queue
         self._client = None
         self._connected = False
+        self._last_send_ts = 0.0  # monotonic time of the last send
 
     async def start(self):
         """Initialize Telethon client and start consuming signals."""
@@ -83,15 +85,20 @@ class TelegramSender:
             return
 
         try:
-            # Random delay 500-800ms between sends (anti-spam)
-            delay = random.uniform(0.5, 0.8)
-            await asyncio.sleep(delay)
+            # Random 500-800ms spacing between sends (anti-spam). Only the
+            # part not already elapsed since the last send is slept, so a
+            # signal after a lull goes out immediately.
+            elapsed = time.monotonic() - self._last_send_ts
+            delay = random.uniform(0.5, 0.8) - elapsed
+            if delay > 0:
+                await asyncio.sleep(delay)
 
             # Send just the contract address — no /buy, no commands
             await self._client.send_message(
                 config.BASED_BOT_USERNAME,
                 contract_address,
             )
+            self._last_send_ts = time.monotonic()
             logger.info(f"[sent] {contract_address} → @{config.BASED_BOT_USERNAME}")
 
         except FloodWaitError as e:
@@ -109,9 +116,6 @@ class TelegramSender:
                     f"[DRY RUN] Signal: {contract_address} "
                     f"(would send to @{config.BASED_BOT_USERNAME})"
                 )
-                print(f"\n{'*'*50}")
-                print(f"  DRY RUN SIGNAL: {contract_address}")
-                print(f"{'*'*50}\n")
                 self.signal_queue.task_done()
             except Exception as e:
                 logger.error(f"Dry run loop error: {e}")
@@ -4,14 +4,20 @@ Run: python3 test_signal_engine.py
 """
 import asyncio
 import sys
+import tempfile
 import time
+from collections import deque
+from pathlib import Path
 
 # Ensure project root is on path
 sys.path.insert(0, ".")
 
 from base.state import TokenState, TokenStateTracker
 from solana.state import SolTokenState, SolTokenStateTracker
+from solana.safety import SolSafetyChecker, _apply_result
 from signal_engine import SignalEngine
+from signal_journal import SignalJournal, read_journal
+from post_mortem import PostMortemRecord
 import config
 
 
@@ -87,14 +93,33 @@ passed = 0
 failed = 0
 
 
-def run(coro):
-    return asyncio.run(coro)
+# One event loop for the whole run — creating and tearing down a loop per
+# evaluate() call costs more than the coroutines under test
+loop = asyncio.new_event_loop()
 
 
-def run_test(name, func):
+# Journal goes to a throwaway dir, never the repo. One instance (one file
+# handle) is shared by every engine the tests build.
+_TMP_DIR = tempfile.TemporaryDirectory()
+JOURNAL = SignalJournal(Path(_TMP_DIR.name) / "signal_journal.jsonl")
+
+
+def make_engine(tracker=None, sol_tracker=None) -> SignalEngine:
+    """Fresh engine (and trackers, unless given) for one test."""
+    if tracker is None:
+        tracker = TokenStateTracker(max_age=300)
+    if sol_tracker is None:
+        sol_tracker = SolTokenStateTracker(max_age=200)
+    return SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker, journal=JOURNAL)
+
+
+async def run_test(name, func):
     global passed, failed
     try:
-        func()
+        if asyncio.iscoroutinefunction(func):
+            await func()
+        else:
+            func()
         print(f"  PASS  {name}")
         passed += 1
     except Exception as e:
@@ -107,119 +132,212 @@ def run_test(name, func):
 # ══════════════════════════════════════════════════════════════
 
 
-def test_evm_signal_fires():
-    tracker = TokenStateTracker(max_age=300)
-    engine = SignalEngine(state_tracker=tracker)
+async def test_evm_signal_fires():
+    engine = make_engine()
     state = make_evm_state()
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is True, "EVM signal should fire"
     assert state.signaled is True
 
 
-def test_evm_too_old():
-    tracker = TokenStateTracker(max_age=300)
-    engine = SignalEngine(state_tracker=tracker)
+async def test_evm_too_old():
+    engine = make_engine()
     state = make_evm_state(first_seen=time.time() - 200)  # 200s > 180s
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Token too old should be rejected"
 
 
-def test_evm_mcap_too_high():
-    tracker = TokenStateTracker(max_age=300)
-    engine = SignalEngine(state_tracker=tracker)
+async def test_evm_mcap_too_high():
+    engine = make_engine()
     state = make_evm_state(estimated_mcap=50000)  # > 30k
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "High mcap should be rejected"
 
 
-def test_evm_unsafe_bytecode():
-    tracker = TokenStateTracker(max_age=300)
-    engine = SignalEngine(state_tracker=tracker)
+async def test_evm_unsafe_bytecode():
+    engine = make_engine()
     state = make_evm_state(bytecode_safe=False)
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Unsafe bytecode should prevent signal"
 
 
-def test_evm_one_signal_per_token():
-    tracker = TokenStateTracker(max_age=300)
-    engine = SignalEngine(state_tracker=tracker)
+async def test_evm_one_signal_per_token():
+    engine = make_engine()
     state = make_evm_state()
-    run(engine.evaluate(state))
-    result2 = run(engine.evaluate(state))
+    await engine.evaluate(state)
+    result2 = await engine.evaluate(state)
     assert result2 is False, "Second eval on same token must not signal again"
 
 
+async def test_evm_rate_limit():
+    """At MAX_SIGNALS_PER_HOUR the engine rejects, unless the oldest
+    timestamps have aged out of the hourly window."""
+    engine = make_engine()
+    now = time.monotonic()
+    engine._signal_timestamps = deque([now - 10] * config.MAX_SIGNALS_PER_HOUR)
+    result = await engine.evaluate(make_evm_state(token_address="0xrate1"))
+    assert result is False, "Signal over hourly limit should be rejected"
+    assert engine._reject_reasons.get("rate_limited") == 1
+
+    engine._signal_timestamps = deque([now - 3700] * config.MAX_SIGNALS_PER_HOUR)
+    result = await engine.evaluate(make_evm_state(token_address="0xrate2"))
+    assert result is True, "Expired timestamps should not count toward the limit"
+    assert engine.get_stats()["signals_this_hour"] == 1
+
+
+async def test_deployer_counted_when_rejected():
+    """A deployer's launches count toward deployer_spam even when they fail
+    other rules (here: liquidity)."""
+    tracker = TokenStateTracker(max_age=300)
+    engine = make_engine(tracker=tracker)
+    state = make_evm_state(token_address="0xlowliq", liquidity_usd=10.0, deployer_address="0xserial")
+    assert await engine.evaluate(state) is False
+    assert tracker.record_deployer("0xserial", "0xnext") == 2
+
+
+async def test_latency_stats():
+    """Time-to-signal aggregates and buckets are kept incrementally."""
+    engine = make_engine()
+    for addr, age, deployer in (("0xlat1", 20, "0xdep1"), ("0xlat2", 70, "0xdep2")):
+        state = make_evm_state(token_address=addr, first_seen=time.time() - age, deployer_address=deployer)
+        assert await engine.evaluate(state) is True
+    stats = engine.get_stats()
+    assert stats["avg_latency_s"] == 45.0
+    assert stats["min_latency_s"] == 20.0
+    assert stats["max_latency_s"] == 70.0
+    assert set(stats["latency_distribution"]) == {"15-30s", "60-90s"}
+
+
+def test_post_mortem_history_bounded():
+    """Post-mortem history is a ring buffer; TP/rug counters follow evictions."""
+    engine = make_engine()
+    engine.post_mortems = deque(maxlen=3)
+
+    def record(change):
+        return PostMortemRecord(
+            token="0xpm", chain="base", latency_s=10.0, mcap_at_signal=10000.0,
+            mcap_10m=10000.0 * (1 + change / 100), liq_10m=5000.0,
+            price_change_pct=change, follow_up_time=time.time(),
+        )
+
+    for change in (50, -80, 0):
+        engine.record_post_mortem(record(change))
+    stats = engine.get_stats()
+    assert stats["post_mortem_count"] == 3
+    assert stats["tp_hit_rate"].startswith("1/3")
+    assert stats["rug_rate"].startswith("1/3")
+
+    # Evicts the TP record
+    engine.record_post_mortem(record(5))
+    stats = engine.get_stats()
+    assert stats["post_mortem_count"] == 3
+    assert stats["tp_hit_rate"].startswith("0/3")
+    assert stats["rug_rate"].startswith("1/3")
+
+
+def test_recent_sell_count():
+    """Dump-monitor sell count only sees the last 60s and trims the head."""
+    state = make_evm_state()
+    now = time.time()
+    state.recent_sell_times = deque([now - 90, now - 61, now - 30, now - 5])
+    assert state.recent_sell_count(now) == 2
+    assert list(state.recent_sell_times) == [now - 30, now - 5]
+    assert state.recent_sell_count(now + 60) == 0
+
+
+def test_dump_alert_queued_once():
+    """record_sell queues a signaled token once its 60s sells hit the threshold."""
+    tracker = TokenStateTracker(max_age=300)
+    tracker.dump_queue = asyncio.Queue()
+    state = make_evm_state(token_address="0xdump1")
+    tracker.states["0xdump1"] = state
+    for _ in range(config.DUMP_SELL_THRESHOLD):
+        tracker.record_sell("0xdump1")
+    assert tracker.dump_queue.empty(), "Unsignaled tokens are not monitored"
+
+    state.signaled = True
+    for _ in range(config.DUMP_SELL_THRESHOLD):
+        tracker.record_sell("0xdump1")
+    assert tracker.dump_queue.qsize() == 1
+    assert tracker.dump_queue.get_nowait() is state
+    assert state.dump_alerted is True
+
+
+def test_journal_format_suffix():
+    """Framed journals get their own suffix and never append to a .jsonl file."""
+    tmp = Path(_TMP_DIR.name)
+    try:
+        SignalJournal(tmp / "mixed.jsonl", fmt="framed")
+        raise AssertionError("framed journal on a .jsonl path must be refused")
+    except ValueError:
+        pass
+    journal = SignalJournal(tmp / "reject.frames", fmt="framed")
+    journal.log_reject("0xframed", "rate_limited")
+    journal.close()
+    records = list(read_journal(tmp / "reject.frames"))
+    assert [r["token"] for r in records] == ["0xframed"]
+
+
 # ══════════════════════════════════════════════════════════════
 #  SOLANA TESTS
 # ══════════════════════════════════════════════════════════════
 
 
-def test_sol_signal_fires():
-    tracker = TokenStateTracker(max_age=300)
-    sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+async def test_sol_signal_fires():
+    engine = make_engine()
     state = make_sol_state()
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is True, "Solana signal should fire"
     assert state.signaled is True
     assert state.dex_version == "solana-raydium"
 
 
-def test_sol_too_old():
-    tracker = TokenStateTracker(max_age=300)
-    sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+async def test_sol_too_old():
+    engine = make_engine()
     # 130s > SOL threshold of 120s
     state = make_sol_state(first_seen=time.time() - 130)
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Solana token >120s should be rejected"
 
 
-def test_sol_evm_age_threshold_difference():
+async def test_sol_evm_age_threshold_difference():
     """EVM allows 180s, Solana only 120s. A 150s-old EVM token should signal,
     but a 150s-old Solana token should not."""
-    tracker = TokenStateTracker(max_age=300)
-    sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+    engine = make_engine()
 
     evm_state = make_evm_state(first_seen=time.time() - 150)
     sol_state = make_sol_state(first_seen=time.time() - 150)
 
-    evm_result = run(engine.evaluate(evm_state))
-    sol_result = run(engine.evaluate(sol_state))
+    evm_result = await engine.evaluate(evm_state)
+    sol_result = await engine.evaluate(sol_state)
 
     assert evm_result is True, "150s EVM token should still signal (< 180s)"
     assert sol_result is False, "150s Solana token should not signal (> 120s)"
 
 
-def test_sol_mint_authority_unsafe():
-    tracker = TokenStateTracker(max_age=300)
-    sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+async def test_sol_mint_authority_unsafe():
+    engine = make_engine()
     state = make_sol_state()
     state.mint_authority = "SomeActiveAuthority1111111111111111111111111"
     state.update_safety()
     assert state.bytecode_safe is False
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Active mint authority should fail safety"
 
 
-def test_sol_freeze_authority_unsafe():
-    tracker = TokenStateTracker(max_age=300)
-    sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+async def test_sol_freeze_authority_unsafe():
+    engine = make_engine()
     state = make_sol_state()
     state.freeze_authority = "SomeFreezeAuthority1111111111111111111111111"
     state.update_safety()
     assert state.bytecode_safe is False
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Active freeze authority should fail safety"
 
 
-def test_sol_deployer_spam():
-    tracker = TokenStateTracker(max_age=300)
+async def test_sol_deployer_spam():
     sol_tracker = SolTokenStateTracker(max_age=200)
-    engine = SignalEngine(state_tracker=tracker, sol_state_tracker=sol_tracker)
+    engine = make_engine(sol_tracker=sol_tracker)
 
     deployer = "SpamDeployer11111111111111111111111111111111"
     # Pre-record deployer activity to exceed threshold (one unique token per call)
@@ -227,7 +345,7 @@ def test_sol_deployer_spam():
         sol_tracker.record_deployer(deployer, f"FakeToken{i}")
 
     state = make_sol_state(deployer_address=deployer)
-    result = run(engine.evaluate(state))
+    result = await engine.evaluate(state)
     assert result is False, "Deployer spam should prevent Solana signal"
 
 
@@ -246,6 +364,25 @@ def test_sol_state_tracker_ttl():
     assert result is None, "Expired Solana token should return None"
 
 
+async def test_sol_mint_not_found_unknown():
+    """A mint the RPC can't see yet is unknown (retried), not unsafe."""
+    checker = SolSafetyChecker("http://rpc.invalid")
+    payloads = []
+
+    async def fake_post(payload):
+        payloads.append(payload)
+        return {"result": {"value": [None]}}
+
+    checker._post = fake_post
+    state = make_sol_state()
+    state.bytecode_safe = None
+    results = await checker.check_mints([state.token_address])
+    assert payloads[0]["params"][1]["commitment"] == "confirmed"
+    assert results[state.token_address]["safe"] is None
+    _apply_result(state, results[state.token_address])
+    assert state.bytecode_safe is None, "Missing mint must stay unchecked"
+
+
 def test_sol_state_properties():
     state = make_sol_state()
     assert state.best_mcap == 12000.0
@@ -264,22 +401,48 @@ def test_sol_state_properties():
 #  RUN ALL TESTS
 # ══════════════════════════════════════════════════════════════
 
-print("\n── EVM Signal Engine Tests ──")
-run_test("evm_signal_fires", test_evm_signal_fires)
-run_test("evm_too_old", test_evm_too_old)
-run_test("evm_mcap_too_high", test_evm_mcap_too_high)
-run_test("evm_unsafe_bytecode", test_evm_unsafe_bytecode)
-run_test("evm_one_signal_per_token", test_evm_one_signal_per_token)
-
-print("\n── Solana Signal Engine Tests ──")
-run_test("sol_signal_fires", test_sol_signal_fires)
-run_test("sol_too_old", test_sol_too_old)
-run_test("sol_evm_age_threshold_difference", test_sol_evm_age_threshold_difference)
-run_test("sol_mint_authority_unsafe", test_sol_mint_authority_unsafe)
-run_test("sol_freeze_authority_unsafe", test_sol_freeze_authority_unsafe)
-run_test("sol_deployer_spam", test_sol_deployer_spam)
-run_test("sol_state_tracker_ttl", test_sol_state_tracker_ttl)
-run_test("sol_state_properties", test_sol_state_properties)
+EVM_TESTS = [
+    ("evm_signal_fires", test_evm_signal_fires),
+    ("evm_too_old", test_evm_too_old),
+    ("evm_mcap_too_high", test_evm_mcap_too_high),
+    ("evm_unsafe_bytecode", test_evm_unsafe_bytecode),
+    ("evm_one_signal_per_token", test_evm_one_signal_per_token),
+    ("evm_rate_limit", test_evm_rate_limit),
+    ("deployer_counted_when_rejected", test_deployer_counted_when_rejected),
+    ("latency_stats", test_latency_stats),
+    ("post_mortem_history_bounded", test_post_mortem_history_bounded),
+    ("recent_sell_count", test_recent_sell_count),
+    ("dump_alert_queued_once", test_dump_alert_queued_once),
+    ("journal_format_suffix", test_journal_format_suffix),
+]
+
+SOL_TESTS = [
+    ("sol_signal_fires", test_sol_signal_fires),
+    ("sol_too_old", test_sol_too_old),
+    ("sol_evm_age_threshold_difference", test_sol_evm_age_threshold_difference),
+    ("sol_mint_authority_unsafe", test_sol_mint_authority_unsafe),
+    ("sol_freeze_authority_unsafe", test_sol_freeze_authority_unsafe),
+    ("sol_deployer_spam", test_sol_deployer_spam),
+    ("sol_state_tracker_ttl", test_sol_state_tracker_ttl),
+    ("sol_mint_not_found_unknown", test_sol_mint_not_found_unknown),
+    ("sol_state_properties", test_sol_state_properties),
+]
+
+
+async def run_group(title, tests):
+    # One loop entry per group instead of one per evaluate() call. Every test
+    # builds its own engine/trackers via make_engine(), so they run
+    # concurrently; the shared JOURNAL and the pass/fail counters are only
+    # touched synchronously between awaits.
+    print(f"\n── {title} ──")
+    await asyncio.gather(*(run_test(name, func) for name, func in tests))
+
+
+loop.run_until_complete(run_group("EVM Signal Engine Tests", EVM_TESTS))
+loop.run_until_complete(run_group("Solana Signal Engine Tests", SOL_TESTS))
+loop.close()
+JOURNAL.close()
+_TMP_DIR.cleanup()
 
 print(f"\n{'='*50}")
 print(f"Results: {passed} passed, {failed} failed out of {passed + failed}")